@@ -1,11 +1,11 @@
 # PyQt5 관련 모듈 임포트
-from PyQt5.QtCore import Qt, QMimeData, QUrl,QTimer,QFileInfo, QDir, QStandardPaths, QPoint,QRect, QSize,QModelIndex, pyqtSignal
+from PyQt5.QtCore import Qt, QMimeData, QUrl,QTimer,QFileInfo, QDir, QStandardPaths, QPoint,QRect, QSize,QModelIndex, pyqtSignal, QObject, QSortFilterProxyModel, QAbstractItemModel, QPersistentModelIndex, QFileSystemWatcher, QDateTime, QLocale, QItemSelectionModel
 from PyQt5.QtGui import QKeySequence, QKeyEvent, QFont,QColor,QPalette # 키보드 이벤트, 폰트, 색상 관련
 from PyQt5.QtWidgets import (
     QSplitter, QApplication, QMainWindow, QFileSystemModel, QTreeView, QPushButton, QGridLayout, QColorDialog,
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QMenu, QAction, QDialog, QFileDialog,QStyledItemDelegate,
     QLabel, QScrollArea, QFrame, QSpacerItem, QSizePolicy,QMessageBox,QInputDialog,QAbstractItemView,QStatusBar,QLayout,  QStyle,
-    QDialogButtonBox
+    QDialogButtonBox, QFileIconProvider, QProgressBar, QSpinBox, QDoubleSpinBox, QComboBox
 ) # 다양한 UI 위젯들
 
 # 파이썬 기본 모듈 임포트
@@ -18,6 +18,20 @@ import ctypes # C 데이터 타입과의 호환성 제공 (윈도우 API 호출
 import tempfile # 임시 파일 및 디렉토리 생성
 import uuid # 범용 고유 식별자 생성 (MAC 주소, 임시 파일 이름 등)
 import functools # 고차 함수 및 호출 가능한 객체 작업을 위한 도구 (partial 등)
+import threading # 백그라운드 작업 스레드 (디렉토리 스캔 등)
+import array # 대용량 목록을 위한 압축 배열 저장소
+import itertools # 작업 번호 생성 등 반복자 도구
+import time # 작업 경과 시간/남은 시간 계산
+import errno # 파일 시스템 오류 코드 (볼륨 간 이동 판별 등)
+import urllib.parse # freedesktop 휴지통 정보 파일 경로 인코딩
+import concurrent.futures # 작은 파일 병렬 복사용 스레드 풀
+import hashlib # 복사 검증용 체크섬
+import zlib # 델타 업데이트용 롤링 체크섬 (adler32)
+import struct # FICLONERANGE ioctl 인자
+try:
+    import fcntl # reflink(FICLONE) 복제용 ioctl (리눅스/유닉스 전용)
+except ImportError:
+    fcntl = None
 from win32com.client import Dispatch
 
 # # --- 하드웨어 바인딩 (MAC 주소 기반 접근 제어) ---
@@ -26,11 +40,767 @@ from win32com.client import Dispatch
 #     # 여기에 허용할 다른 MAC 주소들을 추가할 수 있습니다.
 # ]
 
+# 모델이 목록을 만들 때 저장해 둔 숨김/시스템 속성 (그리기 중에 디스크를 조회하지 않기 위함)
+HIDDEN_ROLE = Qt.UserRole + 16
+FILE_ATTRIBUTE_HIDDEN = 0x2
+FILE_ATTRIBUTE_SYSTEM = 0x4
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+def is_hidden_entry(entry):
+    # os.scandir 항목의 숨김 여부. 윈도우는 목록 조회 시 함께 받은 속성을 사용하므로 추가 I/O 없음
+    # (점으로 시작하는 이름은 윈도우가 아닐 때만 숨김 - QFileInfo.isHidden 과 같은 기준)
+    if os.name != 'nt' and entry.name.startswith('.'):
+        return True
+    try:
+        attributes = getattr(entry.stat(follow_symlinks=False), 'st_file_attributes', 0)
+    except OSError:
+        return False
+    return bool(attributes & (FILE_ATTRIBUTE_HIDDEN | FILE_ATTRIBUTE_SYSTEM))
+
+def is_reparse_point(stat_result):
+    # 윈도우 정션/심볼릭 링크 (os.path.islink 는 정션을 링크로 보지 않음). 다른 OS 에서는 항상 False
+    return bool(getattr(stat_result, 'st_file_attributes', 0) & FILE_ATTRIBUTE_REPARSE_POINT)
+
+def is_reparse_entry(entry):
+    # os.scandir 항목용. 윈도우는 목록 조회 때 받은 속성이라 추가 I/O 없음 (다른 OS 에서는 stat 호출 없이 False)
+    return os.name == 'nt' and is_reparse_point(entry.stat(follow_symlinks=False))
+
+def remove_reparse_point(path):
+    # 링크 자체만 지움 (대상 폴더의 내용은 건드리지 않음). 폴더형 링크는 rmdir, 파일형은 unlink
+    try:
+        os.rmdir(path)
+    except NotADirectoryError:
+        os.unlink(path)
+
+# --- 공유 디렉토리 캐시 (모든 패널이 하나의 QFileSystemModel 을 공유) ---
+class SharedFileSystemService:
+    _source_model = None
+    _hidden_flags = {}
+
+    @classmethod
+    def source_model(cls):
+        # 프로세스 전체에서 하나의 모델(=하나의 gatherer 스레드, 하나의 watcher 집합)만 생성
+        if cls._source_model is None:
+            model = QFileSystemModel()
+            model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot | QDir.Hidden | QDir.System)
+            model.setRootPath('')
+            model.dataChanged.connect(cls._on_source_data_changed)
+            model.rowsAboutToBeRemoved.connect(cls._on_source_rows_removed)
+            model.fileRenamed.connect(cls._on_source_file_renamed)
+            cls._source_model = model
+        return cls._source_model
+
+    @classmethod
+    def is_hidden(cls, source_index):
+        # 처음 한 번은 gatherer 가 채워 둔 QFileInfo 캐시에서 읽고, 이후에는 사전에서만 조회
+        path = cls._source_model.filePath(source_index)
+        hidden = cls._hidden_flags.get(path)
+        if hidden is None:
+            hidden = cls._source_model.fileInfo(source_index).isHidden()
+            cls._hidden_flags[path] = hidden
+        return hidden
+
+    @classmethod
+    def _forget_rows(cls, parent, first, last):
+        for row in range(first, last + 1):
+            cls._hidden_flags.pop(cls._source_model.filePath(cls._source_model.index(row, 0, parent)), None)
+
+    @classmethod
+    def _on_source_data_changed(cls, top_left, bottom_right, roles=None):
+        # 파일 시스템 감시로 항목 정보가 갱신되었을 때만 캐시 무효화
+        cls._forget_rows(top_left.parent(), top_left.row(), bottom_right.row())
+
+    @classmethod
+    def _on_source_rows_removed(cls, parent, first, last):
+        cls._forget_rows(parent, first, last)
+
+    @classmethod
+    def _on_source_file_renamed(cls, path, old_name, new_name):
+        cls._hidden_flags.pop(QDir(path).filePath(old_name), None)
+        cls._hidden_flags.pop(QDir(path).filePath(new_name), None)
+
+    @classmethod
+    def create_panel_model(cls, parent=None):
+        return PanelFileSystemModel(cls.source_model(), parent)
+
+
+class PanelFileSystemModel(QSortFilterProxyModel):
+    # 패널별 정렬 상태만 가지는 얇은 프록시. 디렉토리 메타데이터는 공유 모델에만 존재
+    directoryLoaded = pyqtSignal(str)
+
+    def __init__(self, source_model, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source_model)
+        self.setDynamicSortFilter(False)
+        source_model.directoryLoaded.connect(self.directoryLoaded)
+
+    def index(self, *args):
+        if len(args) == 1 or isinstance(args[0], str):
+            return self.mapFromSource(self.sourceModel().index(*args))
+        return super().index(*args)
+
+    def filePath(self, index):
+        return self.sourceModel().filePath(self.mapToSource(index))
+
+    def fileName(self, index):
+        return self.sourceModel().fileName(self.mapToSource(index))
+
+    def fileInfo(self, index):
+        return self.sourceModel().fileInfo(self.mapToSource(index))
+
+    def isDir(self, index):
+        return self.sourceModel().isDir(self.mapToSource(index))
+
+    def rootPath(self):
+        return self.sourceModel().rootPath()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == HIDDEN_ROLE:
+            return SharedFileSystemService.is_hidden(self.mapToSource(index))
+        return super().data(index, role)
+
+    def lessThan(self, left, right):
+        # QFileSystemModel 과 동일하게 폴더를 항상 먼저, 이후 열 기준 비교
+        src = self.sourceModel()
+        left_is_dir, right_is_dir = src.isDir(left), src.isDir(right)
+        if left_is_dir != right_is_dir:
+            return left_is_dir if self.sortOrder() == Qt.AscendingOrder else right_is_dir
+        column = left.column()
+        if column == 1:
+            left_key, right_key = src.size(left), src.size(right)
+        elif column == 2:
+            left_key, right_key = src.type(left).lower(), src.type(right).lower()
+        elif column == 3:
+            left_key, right_key = src.lastModified(left), src.lastModified(right)
+        else:
+            left_key, right_key = src.fileName(left).lower(), src.fileName(right).lower()
+        if left_key == right_key:
+            return src.fileName(left).lower() < src.fileName(right).lower()
+        return left_key < right_key
+# --- 공유 디렉토리 캐시 끝 ---
+
+# --- [새로운 클래스] 대용량 폴더용 os.scandir 기반 지연 로딩 모델 ---
+class _ScandirListing:
+    # 디렉토리 하나의 목록. 항목마다 객체를 만들지 않고 배열에 열 단위로 보관
+    __slots__ = ("id", "path", "owner", "names", "flags", "sizes", "mtimes", "order", "rows",
+                 "fetched", "loading", "rescan", "generation", "last_used", "cancel_event")
+
+    def __init__(self, listing_id, path, owner):
+        self.id = listing_id
+        self.path = path
+        self.owner = owner                  # None 이면 최상위(앵커) 목록, 아니면 (부모 목록, 항목 번호)
+        self.names = []
+        self.flags = bytearray()
+        self.sizes = array.array('q')
+        self.mtimes = array.array('d')
+        self.order = array.array('l')       # 화면 행 -> 항목 번호
+        self.rows = array.array('l')        # 항목 번호 -> 화면 행 (-1: 목록에서 빠짐)
+        self.fetched = 0                    # 뷰에 노출된 행 수 (fetchMore 로 증가)
+        self.loading = False
+        self.rescan = False
+        self.generation = 0
+        self.last_used = 0
+        self.cancel_event = None
+
+
+class ScandirListModel(QAbstractItemModel):
+    directoryLoaded = pyqtSignal(str)
+    _batch_loaded = pyqtSignal(int, int, object, bool)
+
+    COLUMN_TITLES = ("Name", "Size", "Type", "Date Modified")
+    FIRST_LOAD_BATCH = 200     # 첫 화면을 빨리 띄우기 위한 첫 묶음 크기
+    LOAD_BATCH = 2000          # 백그라운드 스캔이 한 번에 넘겨주는 항목 수
+    FETCH_BATCH = 500          # 뷰가 fetchMore 한 번에 가져가는 행 수
+    MAX_LISTINGS = 16          # 유지할 디렉토리 목록 수 (초과 시 오래 안 쓴 목록부터 정리)
+    PROTECTED_RECENT = 3       # 최근 사용 목록과 그 상위 목록은 정리 대상에서 제외
+    RESCAN_DELAY_MS = 300
+    FLAG_DIR = 0x01
+    FLAG_LINK = 0x02
+    FLAG_HIDDEN = 0x04
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._anchors = []             # 최상위 행에 놓이는 목록들
+        self._listings_by_id = {}
+        self._child_listings = {}      # (부모 목록 id, 항목 번호) -> 하위 폴더 목록
+        self._listings_by_path = {}    # 경로 키 -> [목록, ...]
+        self._next_listing_id = 1
+        self._use_counter = 0
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._icon_provider = QFileIconProvider()
+        self._icon_cache = {}
+        self._type_cache = {}
+        self._pending_rescans = set()
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.timeout.connect(self._start_pending_rescans)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._batch_loaded.connect(self._on_batch_loaded)
+
+    # --- 경로/인덱스 변환 ---
+    @staticmethod
+    def _path_key(path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def _entry_of(self, index):
+        listing = self._listings_by_id.get(index.internalId())
+        if listing is None or index.row() >= listing.fetched:
+            return None, -1
+        return listing, listing.order[index.row()]
+
+    def _listing_for_index(self, index):
+        # 인덱스가 가리키는 폴더의 목록 (아직 로딩 전이면 None)
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            return self._anchors[index.row()] if index.row() < len(self._anchors) else None
+        listing, entry = self._entry_of(index)
+        if listing is None:
+            return None
+        return self._child_listings.get((listing.id, entry))
+
+    def _index_of_listing(self, listing, column=0):
+        if listing.owner is None:
+            return self.createIndex(self._anchors.index(listing), column, 0)
+        parent_listing, entry = listing.owner
+        return self.createIndex(parent_listing.rows[entry], column, parent_listing.id)
+
+    def index(self, *args):
+        if len(args) == 1 or isinstance(args[0], str):
+            return self._index_for_path(args[0])
+        row, column = args[0], args[1]
+        parent = args[2] if len(args) > 2 else QModelIndex()
+        if not 0 <= column < len(self.COLUMN_TITLES):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0) if 0 <= row < len(self._anchors) else QModelIndex()
+        listing = self._listing_for_index(parent)
+        if listing is None or parent.column() != 0 or not 0 <= row < listing.fetched:
+            return QModelIndex()
+        return self.createIndex(row, column, listing.id)
+
+    def _index_for_path(self, path):
+        if not path:
+            path = QDir.rootPath()
+        path = os.path.normpath(path)
+        listings = self._listings_by_path.get(self._path_key(path))
+        if listings:
+            listing = max(listings, key=lambda l: l.last_used)
+            self._touch(listing)
+            return self._index_of_listing(listing)
+
+        # 이미 목록이 있는 폴더의 항목이면 그 행을 돌려줌 (하위 폴더라면 내용 로딩도 시작)
+        name_key = os.path.normcase(os.path.basename(path))
+        for parent_listing in self._listings_by_path.get(self._path_key(os.path.dirname(path)), []):
+            for row in range(parent_listing.fetched):
+                entry = parent_listing.order[row]
+                if os.path.normcase(parent_listing.names[entry]) == name_key:
+                    self._touch(parent_listing)
+                    if parent_listing.flags[entry] & self.FLAG_DIR:
+                        self._open_listing(path, (parent_listing, entry))
+                    return self.createIndex(row, 0, parent_listing.id)
+
+        if not os.path.isdir(path):
+            return QModelIndex()
+        return self._index_of_listing(self._open_listing(path, None))
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        listing = self._listings_by_id.get(index.internalId())
+        if listing is None:
+            return QModelIndex()
+        return self._index_of_listing(listing)
+
+    def sibling(self, row, column, index):
+        return self.index(row, column, self.parent(index))
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._anchors)
+        if parent.column() != 0:
+            return 0
+        listing = self._listing_for_index(parent)
+        return listing.fetched if listing is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMN_TITLES)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return True
+        return parent.column() == 0 and self.isDir(parent)
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.column() != 0 or not self.isDir(parent):
+            return False
+        listing = self._listing_for_index(parent)
+        if listing is None:
+            return True
+        return listing.loading or listing.fetched < len(listing.order)
+
+    def fetchMore(self, parent):
+        if not parent.isValid() or not self.isDir(parent):
+            return
+        listing = self._listing_for_index(parent)
+        if listing is None:
+            listing = self._open_listing(self.filePath(parent), self._entry_of(parent))
+        self._touch(listing)
+        self._expose_rows(listing, self.FETCH_BATCH)
+
+    # --- 패널에서 사용하는 QFileSystemModel 호환 API ---
+    def filePath(self, index):
+        if not index.isValid():
+            return ''
+        if index.internalId() == 0:
+            return self._anchors[index.row()].path if index.row() < len(self._anchors) else ''
+        listing, entry = self._entry_of(index)
+        if listing is None:
+            return ''
+        return os.path.join(listing.path, listing.names[entry])
+
+    def fileName(self, index):
+        path = self.filePath(index)
+        return os.path.basename(path) or path
+
+    def fileInfo(self, index):
+        return QFileInfo(self.filePath(index))
+
+    def isDir(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return True
+        listing, entry = self._entry_of(index)
+        return listing is not None and bool(listing.flags[entry] & self.FLAG_DIR)
+
+    def rootPath(self):
+        return ''
+
+    # --- 표시 ---
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.COLUMN_TITLES):
+            return self.COLUMN_TITLES[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if index.internalId() == 0:
+            if index.row() >= len(self._anchors):
+                return None
+            path = self._anchors[index.row()].path
+            if role == Qt.DisplayRole and column == 0:
+                return os.path.basename(path) or path
+            if role == Qt.DecorationRole and column == 0:
+                return self._icon_provider.icon(QFileIconProvider.Folder)
+            if role == QFileSystemModel.FilePathRole:
+                return path
+            return None
+
+        listing, entry = self._entry_of(index)
+        if listing is None:
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            if column == 0:
+                return listing.names[entry]
+            if column == 1:
+                if listing.flags[entry] & self.FLAG_DIR:
+                    return ""
+                return QLocale.system().formattedDataSize(listing.sizes[entry], 2, QLocale.DataSizeTraditionalFormat)
+            if column == 2:
+                return self._type_name(listing, entry)
+            if column == 3:
+                modified = QDateTime.fromMSecsSinceEpoch(int(listing.mtimes[entry] * 1000))
+                return QLocale.system().toString(modified, QLocale.ShortFormat)
+        elif role == Qt.DecorationRole and column == 0:
+            return self._icon(listing, entry)
+        elif role == Qt.TextAlignmentRole and column == 1:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == QFileSystemModel.FilePathRole:
+            return os.path.join(listing.path, listing.names[entry])
+        elif role == QFileSystemModel.FileNameRole:
+            return listing.names[entry]
+        elif role == HIDDEN_ROLE:
+            return bool(listing.flags[entry] & self.FLAG_HIDDEN)
+        return None
+
+    def _extension_key(self, listing, entry):
+        if listing.flags[entry] & self.FLAG_DIR:
+            return "<dir>"
+        return os.path.splitext(listing.names[entry])[1].lower()
+
+    def _type_name(self, listing, entry):
+        # 종류 문자열은 확장자당 한 번만 조회 (파일마다 셸을 호출하지 않음)
+        key = self._extension_key(listing, entry)
+        if key not in self._type_cache:
+            self._type_cache[key] = self._icon_provider.type(QFileInfo(os.path.join(listing.path, listing.names[entry])))
+        return self._type_cache[key]
+
+    def _icon(self, listing, entry):
+        key = self._extension_key(listing, entry)
+        if key in ('.exe', '.lnk', '.ico', '.url'):
+            # 파일마다 아이콘이 다른 형식만 경로 단위로 캐시
+            key = os.path.join(listing.path, listing.names[entry])
+        if key not in self._icon_cache:
+            if key == "<dir>":
+                self._icon_cache[key] = self._icon_provider.icon(QFileIconProvider.Folder)
+            else:
+                self._icon_cache[key] = self._icon_provider.icon(QFileInfo(os.path.join(listing.path, listing.names[entry])))
+        return self._icon_cache[key]
+
+    # --- 드래그 앤 드롭 ---
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+        if self.isDir(index):
+            flags |= Qt.ItemIsDropEnabled
+        return flags
+
+    def mimeTypes(self):
+        return ['text/uri-list']
+
+    def mimeData(self, indexes):
+        mime_data = QMimeData()
+        paths = []
+        for index in indexes:
+            if index.column() == 0:
+                path = self.filePath(index)
+                if path and path not in paths:
+                    paths.append(path)
+        mime_data.setUrls([QUrl.fromLocalFile(path) for path in paths])
+        return mime_data
+
+    def supportedDragActions(self):
+        return Qt.CopyAction | Qt.MoveAction | Qt.LinkAction
+
+    def supportedDropActions(self):
+        return Qt.CopyAction | Qt.MoveAction | Qt.LinkAction
+
+    def dropMimeData(self, data, action, row, column, parent):
+        # 실제 드롭 처리는 ExplorerPanel.custom_tree_dropEvent 가 담당
+        return False
+
+    # --- 정렬 ---
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        for listing in list(self._listings_by_id.values()):
+            self._sort_listing(listing)
+
+    def _sort_key(self, listing):
+        names, sizes, mtimes = listing.names, listing.sizes, listing.mtimes
+        if self._sort_column == 1:
+            return lambda i: (sizes[i], names[i].lower())
+        if self._sort_column == 2:
+            return lambda i: (os.path.splitext(names[i])[1].lower(), names[i].lower())
+        if self._sort_column == 3:
+            return lambda i: (mtimes[i], names[i].lower())
+        return lambda i: names[i].lower()
+
+    def _sort_listing(self, listing):
+        if self._sort_column < 0 or not listing.order:
+            return
+        # QFileSystemModel 과 같이 정렬 방향과 상관없이 폴더가 먼저
+        flags = listing.flags
+        key = self._sort_key(listing)
+        reverse = self._sort_order == Qt.DescendingOrder
+        dirs = sorted((i for i in listing.order if flags[i] & self.FLAG_DIR), key=key, reverse=reverse)
+        files = sorted((i for i in listing.order if not flags[i] & self.FLAG_DIR), key=key, reverse=reverse)
+        new_order = array.array('l', dirs + files)
+        if new_order != listing.order:
+            self._replace_order(listing, new_order, listing.fetched)
+
+    def _replace_order(self, listing, new_order, fetched):
+        # 행 순서를 통째로 바꾸고 선택/루트 등 영구 인덱스를 새 행으로 옮김 (사라진 항목은 무효화)
+        parent_index = QPersistentModelIndex(self._index_of_listing(listing))
+        self.layoutAboutToBeChanged.emit([parent_index], QAbstractItemModel.VerticalSortHint)
+        old_persistent = [idx for idx in self.persistentIndexList() if idx.internalId() == listing.id]
+        old_entries = [listing.order[idx.row()] if idx.row() < len(listing.order) else -1 for idx in old_persistent]
+        for entry in listing.order:
+            listing.rows[entry] = -1
+        listing.order = new_order
+        for row, entry in enumerate(new_order):
+            listing.rows[entry] = row
+        listing.fetched = min(fetched, len(new_order))
+        new_persistent = []
+        for idx, entry in zip(old_persistent, old_entries):
+            new_row = listing.rows[entry] if entry >= 0 else -1
+            if new_row < 0:
+                new_persistent.append(QModelIndex())
+                continue
+            # 선택/루트로 잡힌 항목은 정렬 후에도 노출 범위 안에 남도록 함
+            listing.fetched = max(listing.fetched, new_row + 1)
+            new_persistent.append(self.createIndex(new_row, idx.column(), listing.id))
+        self.changePersistentIndexList(old_persistent, new_persistent)
+        self.layoutChanged.emit([parent_index], QAbstractItemModel.VerticalSortHint)
+
+    # --- 목록 생성/스캔 ---
+    def _touch(self, listing):
+        self._use_counter += 1
+        listing.last_used = self._use_counter
+
+    def _open_listing(self, path, owner):
+        if owner is not None:
+            existing = self._child_listings.get((owner[0].id, owner[1]))
+        else:
+            existing = next((l for l in self._anchors if self._path_key(l.path) == self._path_key(path)), None)
+        if existing is not None:
+            self._touch(existing)
+            return existing
+
+        listing = _ScandirListing(self._next_listing_id, os.path.normpath(path), owner)
+        self._next_listing_id += 1
+        if owner is None:
+            self.beginInsertRows(QModelIndex(), len(self._anchors), len(self._anchors))
+            self._anchors.append(listing)
+        else:
+            self._child_listings[(owner[0].id, owner[1])] = listing
+        self._listings_by_id[listing.id] = listing
+        same_path = self._listings_by_path.setdefault(self._path_key(listing.path), [])
+        same_path.append(listing)
+        if owner is None:
+            self.endInsertRows()
+        if len(same_path) == 1:
+            self._watcher.addPath(listing.path)
+        self._touch(listing)
+        self._start_scan(listing)
+        self._prune_listings()
+        return listing
+
+    def _start_scan(self, listing):
+        if listing.cancel_event is not None:
+            listing.cancel_event.set()
+        listing.generation += 1
+        listing.loading = True
+        listing.rescan = bool(listing.names)
+        listing.cancel_event = threading.Event()
+        worker = threading.Thread(
+            target=self._scan_directory,
+            args=(listing.id, listing.generation, listing.path, listing.cancel_event, listing.rescan),
+            daemon=True)
+        worker.start()
+
+    def _scan_directory(self, listing_id, generation, path, cancel_event, rescan):
+        # 작업 스레드: 모델 상태는 건드리지 않고 묶음 단위로 시그널만 보냄 (재스캔은 한 번에)
+        batch = []
+        batch_limit = self.FIRST_LOAD_BATCH
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if cancel_event.is_set():
+                        return
+                    batch.append(self._entry_record(entry))
+                    if not rescan and len(batch) >= batch_limit:
+                        self._batch_loaded.emit(listing_id, generation, batch, False)
+                        batch = []
+                        batch_limit = self.LOAD_BATCH
+        except OSError as e:
+            print(f"디렉토리 스캔 오류 ({path}): {e}")
+        if not cancel_event.is_set():
+            self._batch_loaded.emit(listing_id, generation, batch, True)
+
+    @classmethod
+    def _entry_record(cls, entry):
+        flags = 0
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            flags |= cls.FLAG_DIR
+        try:
+            if entry.is_symlink():
+                flags |= cls.FLAG_LINK
+            if is_hidden_entry(entry):
+                flags |= cls.FLAG_HIDDEN
+            stat_result = entry.stat()
+            size, mtime = (0 if is_dir else stat_result.st_size), stat_result.st_mtime
+        except OSError:
+            size, mtime = 0, 0.0
+        return (entry.name, flags, size, mtime)
+
+    def _on_batch_loaded(self, listing_id, generation, batch, done):
+        listing = self._listings_by_id.get(listing_id)
+        if listing is None or listing.generation != generation:
+            return
+        first_batch = not listing.names
+        if listing.rescan:
+            self._apply_rescan(listing, batch)
+        else:
+            self._append_entries(listing, batch)
+        if done:
+            listing.loading = False
+            listing.cancel_event = None
+            self._sort_listing(listing)
+        if listing.fetched < self.FETCH_BATCH:
+            self._expose_rows(listing, self.FETCH_BATCH - listing.fetched)
+        if first_batch or done:
+            self.directoryLoaded.emit(listing.path)
+
+    def _append_entries(self, listing, records):
+        for name, flags, size, mtime in records:
+            entry = len(listing.names)
+            listing.names.append(name)
+            listing.flags.append(flags)
+            listing.sizes.append(size)
+            listing.mtimes.append(mtime)
+            listing.rows.append(len(listing.order))
+            listing.order.append(entry)
+
+    def _expose_rows(self, listing, count):
+        count = min(count, len(listing.order) - listing.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(self._index_of_listing(listing), listing.fetched, listing.fetched + count - 1)
+        listing.fetched += count
+        self.endInsertRows()
+
+    def _on_directory_changed(self, path):
+        self._pending_rescans.add(self._path_key(path))
+        self._rescan_timer.start(self.RESCAN_DELAY_MS)
+
+    def _start_pending_rescans(self):
+        pending, self._pending_rescans = self._pending_rescans, set()
+        for key in pending:
+            for listing in self._listings_by_path.get(key, []):
+                if os.path.isdir(listing.path):
+                    self._start_scan(listing)
+
+    def _apply_rescan(self, listing, records):
+        # 다시 스캔한 결과를 기존 목록과 비교해 필요한 행만 삭제/갱신/추가
+        current = {listing.names[entry]: entry for entry in listing.order}
+        seen = set()
+        new_records = []
+        changed_entries = []
+        for record in records:
+            name, flags, size, mtime = record
+            entry = current.get(name)
+            if entry is None:
+                new_records.append(record)
+                continue
+            seen.add(name)
+            if listing.flags[entry] != flags or listing.sizes[entry] != size or listing.mtimes[entry] != mtime:
+                listing.flags[entry] = flags
+                listing.sizes[entry] = size
+                listing.mtimes[entry] = mtime
+                changed_entries.append(entry)
+
+        if len(seen) < len(current):
+            gone = set(entry for name, entry in current.items() if name not in seen)
+            for entry in gone:
+                child = self._child_listings.get((listing.id, entry))
+                if child is not None:
+                    self._drop_listing_tree(child, notify=False)
+            kept_fetched = sum(1 for row in range(listing.fetched) if listing.order[row] not in gone)
+            new_order = array.array('l', (entry for entry in listing.order if entry not in gone))
+            self._replace_order(listing, new_order, kept_fetched)
+
+        # 삭제로 행 번호가 당겨졌을 수 있으므로 항목 번호 -> 현재 행으로 변환 (-1: 목록에서 빠짐)
+        changed_rows = [listing.rows[entry] for entry in changed_entries if listing.rows[entry] >= 0]
+        parent_index = self._index_of_listing(listing)
+        for row in changed_rows:
+            if row < listing.fetched:
+                self.dataChanged.emit(self.index(row, 0, parent_index),
+                                      self.index(row, len(self.COLUMN_TITLES) - 1, parent_index))
+        if new_records:
+            fully_exposed = listing.fetched == len(listing.order)
+            self._append_entries(listing, new_records)
+            if fully_exposed:
+                self._expose_rows(listing, len(new_records))
+
+    # --- 오래 안 쓴 목록 정리 ---
+    def _ancestors(self, listing):
+        chain = []
+        while listing is not None:
+            chain.append(listing)
+            listing = listing.owner[0] if listing.owner else None
+        return chain
+
+    def _descendants(self, listing):
+        return [l for l in self._listings_by_id.values() if l is not listing and listing in self._ancestors(l)]
+
+    def _prune_listings(self):
+        if len(self._listings_by_id) <= self.MAX_LISTINGS:
+            return
+        by_recent = sorted(self._listings_by_id.values(), key=lambda l: l.last_used, reverse=True)
+        # 최근 사용 목록 + 뷰가 붙잡고 있는 목록(루트, 펼친 폴더, 선택 항목)과 그 상위 목록은 유지
+        in_use = list(by_recent[:self.PROTECTED_RECENT])
+        for idx in self.persistentIndexList():
+            listing = self._listing_for_index(idx)
+            if listing is None and idx.internalId() != 0:
+                listing = self._listings_by_id.get(idx.internalId())
+            if listing is not None:
+                in_use.append(listing)
+        protected = set()
+        for listing in in_use:
+            protected.update(l.id for l in self._ancestors(listing))
+        for listing in reversed(by_recent):
+            if len(self._listings_by_id) <= self.MAX_LISTINGS:
+                break
+            if listing.id in protected or listing.id not in self._listings_by_id:
+                continue
+            if any(l.id in protected for l in self._descendants(listing)):
+                continue
+            self._drop_listing_tree(listing)
+
+    def _drop_listing_tree(self, listing, notify=True):
+        # 하위 목록부터 정리. notify=False 는 상위 행이 이미 뷰에서 사라진 경우
+        for child in sorted(self._descendants(listing), key=lambda l: len(self._ancestors(l)), reverse=True):
+            self._drop_listing(child, notify)
+        self._drop_listing(listing, notify)
+
+    def _drop_listing(self, listing, notify=True):
+        if listing.id not in self._listings_by_id:
+            return
+        if listing.cancel_event is not None:
+            listing.cancel_event.set()
+        if listing.owner is None:
+            row = self._anchors.index(listing)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._anchors.pop(row)
+            self._forget_listing(listing)
+            self.endRemoveRows()
+            return
+        if notify and listing.fetched > 0:
+            self.beginRemoveRows(self._index_of_listing(listing), 0, listing.fetched - 1)
+            listing.fetched = 0
+            self.endRemoveRows()
+        self._forget_listing(listing)
+
+    def _forget_listing(self, listing):
+        self._listings_by_id.pop(listing.id, None)
+        if listing.owner is not None:
+            self._child_listings.pop((listing.owner[0].id, listing.owner[1]), None)
+        key = self._path_key(listing.path)
+        same_path = self._listings_by_path.get(key, [])
+        if listing in same_path:
+            same_path.remove(listing)
+        if not same_path:
+            self._listings_by_path.pop(key, None)
+            self._watcher.removePath(listing.path)
+
+    def is_loading(self, path):
+        return any(listing.loading for listing in self._listings_by_path.get(self._path_key(path), []))
+
+    def release(self):
+        # 패널 휴면 시: 진행 중인 스캔을 멈추고 폴더 감시 해제 (모델 삭제는 호출한 쪽에서)
+        self._rescan_timer.stop()
+        self._pending_rescans.clear()
+        for listing in self._listings_by_id.values():
+            if listing.cancel_event is not None:
+                listing.cancel_event.set()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+# --- 지연 로딩 모델 끝 ---
+
 class HiddenFileDelegate(QStyledItemDelegate):
     def initStyleOption(self, option, index):
         super().initStyleOption(option, index)
-        file_path = index.model().filePath(index)
-        if QFileInfo(file_path).isHidden():
+        if index.data(HIDDEN_ROLE):
             option.palette.setColor(QPalette.Text, QColor("gray"))
             option.palette.setColor(QPalette.HighlightedText, QColor("#D3D3D3"))
 
@@ -72,16 +842,2824 @@ def show_windows_properties(path):
     sei.hInstApp = None
     ctypes.windll.shell32.ShellExecuteExW(ctypes.byref(sei))
 
+# --- 앱 설정 (설정 파일 위치 및 공통 옵션) ---
+def get_app_config_path(filename):
+    config_dir = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "MyMultiExplorer")
+    os.makedirs(config_dir, exist_ok=True)
+    return os.path.join(config_dir, filename)
+
+
+class AppSettings:
+    # 패널/레이아웃과 무관한 앱 전체 옵션 (백업 한도 등). 값이 바뀔 때마다 바로 저장
+    CONFIG_FILENAME = "app_settings.json"
+    _values = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load(cls):
+        if cls._values is None:
+            cls._values = {}
+            try:
+                with open(get_app_config_path(cls.CONFIG_FILENAME), 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict): cls._values = loaded
+            except (OSError, ValueError):
+                pass
+        return cls._values
+
+    @classmethod
+    def get(cls, key, default=None):
+        with cls._lock:
+            return cls._load().get(key, default)
+
+    @classmethod
+    def set(cls, key, value):
+        with cls._lock:
+            values = cls._load()
+            values[key] = value
+            try:
+                with open(get_app_config_path(cls.CONFIG_FILENAME), 'w', encoding='utf-8') as f:
+                    json.dump(values, f, ensure_ascii=False, indent=4)
+            except OSError as e:
+                print(f"설정 저장 오류: {e}")
+# --- 앱 설정 끝 ---
+
+# --- [새로운 클래스] 같은 볼륨 휴지통 (삭제 = 이름 변경 한 번) ---
+class TrashStore:
+    UNDO_DIR_NAME = "explorerpanel_undo"
+    VOLUME_TRASH_DIR_NAME = ".explorerpanel_trash"
+
+    @staticmethod
+    def fallback_dir():
+        # 같은 볼륨에 휴지통을 만들 수 없을 때 복사본을 두는 곳 (기존 백업 위치)
+        return os.path.join(tempfile.gettempdir(), TrashStore.UNDO_DIR_NAME)
+
+    @staticmethod
+    def _device_of(path):
+        while path and not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path: break
+            path = parent
+        return os.stat(path).st_dev
+
+    @staticmethod
+    def mount_point(path):
+        path = os.path.abspath(path)
+        while not os.path.ismount(path):
+            parent = os.path.dirname(path)
+            if parent == path: break
+            path = parent
+        return path
+
+    @staticmethod
+    def _is_freedesktop():
+        return sys.platform.startswith('linux')
+
+    @classmethod
+    def _candidate_dirs(cls, path):
+        # (휴지통 루트, freedesktop 형식 여부) 후보를 우선순위대로
+        if cls._is_freedesktop():
+            data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser("~"), ".local", "share")
+            yield os.path.join(data_home, "Trash"), True
+            yield os.path.join(cls.mount_point(path), f".Trash-{os.getuid()}"), True
+        else:
+            yield cls.fallback_dir(), False
+            yield os.path.join(cls.mount_point(path), cls.VOLUME_TRASH_DIR_NAME), False
+
+    @classmethod
+    def staging_dir_for(cls, path):
+        # 삭제할 항목과 같은 파일 시스템에 있는 휴지통 루트 (없으면 None)
+        try:
+            item_device = os.lstat(path).st_dev
+        except OSError:
+            return None, False
+        for trash_root, is_freedesktop in cls._candidate_dirs(path):
+            try:
+                if cls._device_of(trash_root) != item_device: continue
+                files_dir = os.path.join(trash_root, "files") if is_freedesktop else trash_root
+                created = not os.path.isdir(trash_root)
+                os.makedirs(files_dir, exist_ok=True)
+                if is_freedesktop:
+                    os.makedirs(os.path.join(trash_root, "info"), exist_ok=True)
+                if created and os.name == 'nt':
+                    ctypes.windll.kernel32.SetFileAttributesW(trash_root, FILE_ATTRIBUTE_HIDDEN)
+                if os.stat(files_dir).st_dev == item_device:
+                    return trash_root, is_freedesktop
+            except OSError:
+                continue
+        return None, False
+
+    @classmethod
+    def move_to_trash(cls, path):
+        # 같은 볼륨 휴지통으로 os.rename 한 번. 불가능하면 OSError(EXDEV) 를 올려 호출 측이 복사 대체를 선택
+        path = os.path.normpath(path)
+        trash_root, is_freedesktop = cls.staging_dir_for(path)
+        if trash_root is None:
+            raise OSError(errno.EXDEV, "같은 볼륨에 휴지통을 만들 수 없습니다", path)
+        name = os.path.basename(path)
+        if is_freedesktop:
+            backup_path, info_path = cls._reserve_freedesktop_name(trash_root, name, path)
+            try:
+                os.rename(path, backup_path)
+            except OSError:
+                os.remove(info_path)
+                raise
+            return {'type': 'delete', 'path': path, 'backup': backup_path, 'trash_info': info_path}
+        backup_path = os.path.join(trash_root, name + "_" + str(uuid.uuid4().hex[:8]))
+        os.rename(path, backup_path)
+        return {'type': 'delete', 'path': path, 'backup': backup_path}
+
+    @staticmethod
+    def _reserve_freedesktop_name(trash_root, name, original_path):
+        # freedesktop 휴지통 규약: info 파일을 O_EXCL 로 먼저 만들어 이름을 선점
+        counter = 1
+        trash_name = name
+        while True:
+            info_path = os.path.join(trash_root, "info", trash_name + ".trashinfo")
+            backup_path = os.path.join(trash_root, "files", trash_name)
+            try:
+                fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                counter += 1
+                trash_name = f"{name}.{counter}"
+                continue
+            if os.path.lexists(backup_path):
+                os.close(fd)
+                os.remove(info_path)
+                counter += 1
+                trash_name = f"{name}.{counter}"
+                continue
+            deletion_date = time.strftime("%Y-%m-%dT%H:%M:%S")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(f"[Trash Info]\nPath={urllib.parse.quote(original_path)}\nDeletionDate={deletion_date}\n")
+            return backup_path, info_path
+
+    @staticmethod
+    def restore(action):
+        # 실행 취소: 같은 볼륨이면 이름 변경 한 번으로 복원
+        if os.path.lexists(action['path']):
+            raise FileExistsError(errno.EEXIST, "같은 이름의 항목이 이미 있습니다", action['path'])
+        shutil.move(action['backup'], action['path'])
+        trash_info = action.get('trash_info')
+        if trash_info and os.path.exists(trash_info):
+            os.remove(trash_info)
+# --- 같은 볼륨 휴지통 끝 ---
+
+# --- [새로운 클래스] 대상 이름 배정 (폴더 목록 한 번 + 원자적 선점) ---
+class NameAllocator:
+    # 대상 폴더 목록을 한 번만 읽어 집합으로 두고, 겹치지 않는 "이름 (n).ext" 를 여러 항목에 한 번에 배정
+    def __init__(self, dest_dir, reserved_names=()):
+        self.dest_dir = dest_dir
+        self.taken = set()
+        self._next_counter = {}   # 원래 이름 -> 다음에 시도할 번호 (같은 이름을 여러 번 붙여넣을 때 처음부터 다시 세지 않음)
+        try:
+            with os.scandir(dest_dir) as entries:
+                for entry in entries:
+                    self.taken.add(self._key(entry.name))
+        except OSError:
+            pass
+        self.taken.update(self._key(name) for name in reserved_names)
+
+    @staticmethod
+    def _key(name):
+        return os.path.normcase(name)   # 윈도우는 대소문자를 구분하지 않음
+
+    def is_taken(self, name):
+        return self._key(name) in self.taken
+
+    def _candidates(self, name):
+        yield name
+        base, ext = os.path.splitext(name)
+        counter = self._next_counter.get(self._key(name), 1)
+        while True:
+            self._next_counter[self._key(name)] = counter + 1
+            yield f"{base} ({counter}){ext}"
+            counter += 1
+
+    def allocate(self, name):
+        # 목록 기준으로만 배정 (디스크에 자리를 만들지 않음)
+        for candidate in self._candidates(name):
+            if not self.is_taken(candidate):
+                self.taken.add(self._key(candidate))
+                return candidate
+
+    def claim(self, name, is_dir=False):
+        # 배정한 이름을 mkdir / O_EXCL 로 바로 만들어 선점. 그 사이 다른 프로그램이 만든 이름이면 다음 번호로
+        for candidate in self._candidates(name):
+            if self.is_taken(candidate):
+                continue
+            self.taken.add(self._key(candidate))
+            path = os.path.join(self.dest_dir, candidate)
+            try:
+                if is_dir:
+                    os.mkdir(path)
+                else:
+                    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+                return candidate
+            except FileExistsError:
+                continue
+# --- 대상 이름 배정 끝 ---
+
+# --- [새로운 클래스] 백그라운드 파일 작업 (복사/이동/삭제) ---
+class JobCancelled(Exception):
+    pass
+
+
+class ChecksumMismatch(OSError):
+    # 복사 검증: 다시 읽은 대상의 해시가 복사하며 계산한 원본 해시와 다름
+    pass
+
+
+def format_bytes(size):
+    return QLocale.system().formattedDataSize(int(size), 1, QLocale.DataSizeTraditionalFormat)
+
+
+def format_seconds(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class SourceScan:
+    # 사전 점검에서 훑은 원본 하나. 복사 단계가 트리를 다시 훑지 않도록 목록을 그대로 넘김
+    __slots__ = ('path', 'is_dir', 'bytes_total', 'files_total', 'dirs', 'files', 'complete')
+
+    def __init__(self, path):
+        self.path = path
+        self.is_dir = False
+        self.bytes_total = 0
+        self.files_total = 0
+        self.dirs = []        # 원본 기준 상대 경로, 상위 폴더가 먼저 ('' 는 원본 자신)
+        self.files = []       # [(상대 경로, 크기)]
+        self.complete = True  # 읽지 못한 폴더가 있으면 False -> 복사 단계에서 직접 훑어 실제 오류를 보고
+
+
+class TokenBucket:
+    # 초당 바이트 제한 (0 = 제한 없음). 여러 작업/복사 스레드가 함께 쓰며, 실행 중에도 한도를 바꿀 수 있음
+    BURST_SECONDS = 0.5
+
+    def __init__(self, rate=0):
+        self._lock = threading.Lock()
+        self.rate = max(0, int(rate))
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = max(0, int(rate))
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self.rate * self.BURST_SECONDS, self._tokens + (now - self._updated) * self.rate)
+        else:
+            self._tokens = 0.0
+        self._updated = now
+
+    def consume(self, count):
+        with self._lock:
+            self._refill()
+            if self.rate > 0:
+                self._tokens -= count
+
+    def wait_time(self):
+        # 이미 쓴 만큼을 한도 안으로 되돌리려면 기다려야 할 시간(초). 한도를 풀면 바로 0
+        with self._lock:
+            self._refill()
+            if self.rate <= 0 or self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class JobCheckpointLog:
+    # 복사/이동 작업의 재시작용 기록 (작업 하나 = 파일 하나, JSON Lines)
+    # 계획(항목 목록) 한 줄 뒤에 끝난 항목/파일을 한 줄씩 덧붙임. 큰 파일의 중단 위치는 .explorerpanel-resume 정보 파일에 있음
+    DIRNAME = "job_checkpoints"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    @classmethod
+    def directory(cls):
+        path = get_app_config_path(cls.DIRNAME)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @classmethod
+    def create(cls, job):
+        log = cls(os.path.join(cls.directory(), f"{uuid.uuid4().hex}.jsonl"))
+        log._write({'r': 'plan', 'kind': job.checkpoint_kind, 'title': job.title, 'items': job.items,
+                    'verify': job.verify, 'merge': job.merge, 'compare_hash': job.compare_hash,
+                    'group': job.journal_group, 'placeholders': sorted(job.placeholders)}, sync=True)
+        return log
+
+    def _write(self, record, sync=False):
+        with self._lock:
+            if self._file is None: return
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            if sync: os.fsync(self._file.fileno())
+
+    def item_done(self, path):
+        self._write({'i': path})
+
+    def file_done(self, path):
+        self._write({'f': path})
+
+    def close(self, remove=True):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if remove:
+            self.discard(self.path)
+
+    @staticmethod
+    def discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @classmethod
+    def load_all(cls):
+        # 지난 실행에서 정리되지 않은 기록: [(파일 경로, 계획, 끝난 항목 집합, 끝난 파일 집합)]
+        results = []
+        for entry in sorted(os.scandir(cls.directory()), key=lambda entry: entry.stat().st_mtime):
+            if not entry.name.endswith(".jsonl"): continue
+            plan, done_items, done_files = None, set(), set()
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue   # 마지막 줄이 쓰다 만 상태일 수 있음
+                        if record.get('r') == 'plan': plan = record
+                        elif 'i' in record: done_items.add(record['i'])
+                        elif 'f' in record: done_files.add(record['f'])
+            except OSError:
+                continue
+            if plan is None:
+                cls.discard(entry.path)
+                continue
+            results.append((entry.path, plan, done_items, done_files))
+        return results
+
+    @staticmethod
+    def make_job(plan, items, done_files):
+        job_classes = {job_class.checkpoint_kind: job_class for job_class in FileJob.__subclasses__() if job_class.checkpoint_kind}
+        job = job_classes[plan['kind']](items, plan['title'])
+        job.resume_partial = True
+        job.verify = plan.get('verify', False)
+        job.merge = plan.get('merge', False)
+        job.compare_hash = plan.get('compare_hash', False)
+        job.completed_files = set(done_files)
+        job.placeholders = set(plan.get('placeholders', ())) & {dst for src, dst in items}
+        return job
+
+
+class FileJob:
+    # 작업 스레드에서 실행되는 파일 작업 하나. 진행 상황은 FileJobManager 시그널로 GUI 에 전달
+    STATE_QUEUED = "대기"
+    STATE_RUNNING = "진행 중"
+    STATE_PAUSED = "일시정지"
+    STATE_CANCELLED = "취소됨"
+    STATE_DONE = "완료"
+    STATE_FAILED = "실패"
+    PRIORITY_HIGH = 1
+    PRIORITY_NORMAL = 0
+    PRIORITY_LOW = -1
+    PRIORITY_LABELS = [(PRIORITY_HIGH, "높음"), (PRIORITY_NORMAL, "보통"), (PRIORITY_LOW, "낮음")]
+    FINISHED_STATES = (STATE_CANCELLED, STATE_DONE, STATE_FAILED)
+
+    COPY_BUFFER_SIZE = 1024 * 1024
+    REPORT_INTERVAL = 0.2
+    COPY_WORKERS_SETTING = "copy_workers_by_device"   # {대상 드라이브(마운트 지점): 복사 스레드 수}
+    DEFAULT_COPY_WORKERS = 4
+    MAX_COPY_WORKERS = 64
+    LARGE_FILE_THRESHOLD = 64 * 1024 * 1024   # 이 크기 이상은 커널 복사(copy_file_range/sendfile) + 이어받기
+    LARGE_FILE_CHUNK = 32 * 1024 * 1024
+    LARGE_FILE_RETRIES = 3
+    RESUME_SUFFIX = ".explorerpanel-resume"
+    SCAN_WORKERS = 8
+    LOW_SPACE_MARGIN = 0.9                    # 필요한 용량이 여유 공간의 90% 를 넘으면 경고
+    VERIFY_SETTING = "verify_copies"
+    MERGE_HASH_SETTING = "merge_compare_hash"
+    MTIME_TOLERANCE_NS = 2 * 10**9           # FAT 등은 수정 시각을 2초 단위로 저장
+    DELTA_MIN_SIZE = 64 * 1024 * 1024        # 병합에서 이보다 큰 파일이 바뀌었으면 블록 단위 델타로 갱신
+    DELTA_BLOCK_SIZE = 128 * 1024            # 4096 의 배수 (블록 복제가 가능하도록)
+    DELTA_ROLL_LIMIT = 256 * 1024            # 어긋난 뒤 바이트 단위로 다시 맞춰 볼 최대 거리 (넘으면 블록 단위로만 비교)
+    DELTA_SEGMENT = 8 * 1024 * 1024
+    DELETE_WORKERS = 16                      # unlink 는 메타데이터 작업이라 HDD 에서도 동시에 여러 개가 유리
+    DELETE_BATCH = 256                       # 작업 스레드에 한 번에 넘길 파일 수 (같은 폴더)
+    DELTA_SUFFIX = ".explorerpanel-delta"
+    FICLONERANGE = 0x4020940D
+    MANIFEST_DIRNAME = "manifests"
+    THROTTLE_SLICE = 0.1                      # 속도 제한 대기 중에도 일시정지/취소/한도 변경을 이 간격으로 확인
+    FICLONE = 0x40049409                      # linux/fs.h: _IOW(0x94, 9, int)
+    CLONE_UNSUPPORTED_ERRNOS = (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS, errno.EPERM)
+
+    _clone_unsupported = set()   # reflink 를 지원하지 않는 (원본 장치, 대상 장치) 조합
+    journaled = True           # 끝난 항목을 작업 저널에 트랜잭션으로 기록
+    checkpoint_kind = None    # 재시작 후 이어서 할 수 있는 작업 종류 (JobCheckpointLog)
+
+    _id_counter = itertools.count(1)
+
+    def __init__(self, title):
+        self.id = next(FileJob._id_counter)
+        self.title = title
+        self.state = FileJob.STATE_QUEUED
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.bytes_cloned = 0      # reflink 로 블록을 공유한 바이트
+        self.bytes_copied = 0      # 실제로 읽고 쓴 바이트
+        self.current_item = ""
+        self.errors = []
+        self.notes = []            # 작업 방식 안내 등 오류가 아닌 메시지
+        self.undo_actions = []     # 끝난 항목. 작업 저널에는 항목마다 바로 기록되고, 작업이 끝나면 확정
+        self.journal_group = None
+        self.resume_partial = False   # 다시 시도하는 작업: 이미 만들어진 폴더/이어받기 정보를 그대로 사용
+        self.placeholders = set()     # NameAllocator.claim 으로 미리 만들어 둔 빈 대상 (이 자리에 복사/이동)
+        self.sources = None           # to_folder 로 만든 작업: 사전 점검 뒤에 대상 이름을 배정
+        self.destination_folder = None
+        self.attention_message = ""   # 사용자 확인이 필요한 사전 점검 결과
+        self.priority = FileJob.PRIORITY_NORMAL
+        self.devices = frozenset()    # 읽고 쓰는 장치(st_dev). 같은 장치를 쓰는 작업끼리는 차례로 실행
+        self.bandwidth = TokenBucket()   # 작업별 속도 제한 (전체 제한은 FileJobManager.bandwidth)
+        self.verify = False           # 복사하며 원본 해시를 계산하고, 대상만 다시 읽어 비교
+        self.manifest = []            # [(원본 sha256, 대상 경로)] 검증한 파일 목록
+        self.verify_failures = []
+        self.resume_log = None        # JobCheckpointLog
+        self.completed_files = set()  # 재시작 전 실행에서 이미 복사를 끝낸 파일 (건너뜀)
+        self.merge = False            # 병합: 같은 이름이 있으면 새 이름 대신 기존 트리에 바뀐 파일만 복사
+        self.compare_hash = False     # 병합 시 크기가 같으면 수정 시각 대신 내용(sha256)으로 비교
+        self.files_skipped = 0        # 병합에서 바뀌지 않아 건너뛴 파일
+        self.on_commit = None      # GUI 스레드에서 on_commit(job) 호출
+        self.manager = None
+        self.started_at = None
+        self.finished_at = None
+        self._paused_seconds = 0.0
+        self._paused_at = None
+        self._last_report = 0.0
+        self._progress_lock = threading.Lock()   # 병렬 복사 스레드들이 함께 갱신
+        self._pause_event = threading.Event()
+        self._pause_event.set()
+        self._cancel_event = threading.Event()
+
+    @classmethod
+    def to_folder(cls, sources, destination_folder, title):
+        # 붙여넣기/드롭: 원본 목록과 대상 폴더만 받고, 이름 배정/자리 선점은 작업 스레드에서 사전 점검 뒤에
+        job = cls([], title)
+        job.sources = list(sources)
+        job.destination_folder = destination_folder
+        return job
+
+    def io_paths(self):
+        # 스케줄러가 장치를 판단할 경로 (원본과 대상 폴더)
+        paths = list(self.sources or [])
+        if self.destination_folder: paths.append(self.destination_folder)
+        for src, dst in getattr(self, 'items', ()):
+            paths += [src, os.path.dirname(dst)]
+        return paths
+
+    # --- GUI 에서 호출 ---
+    def pause(self):
+        if self.state == FileJob.STATE_RUNNING:
+            self._pause_event.clear()
+            self._paused_at = time.monotonic()
+            self.state = FileJob.STATE_PAUSED
+            self.report(force=True)
+
+    def resume(self):
+        if self.state == FileJob.STATE_PAUSED:
+            if self._paused_at is not None:
+                self._paused_seconds += time.monotonic() - self._paused_at
+                self._paused_at = None
+            self.state = FileJob.STATE_RUNNING
+            self._pause_event.set()
+            self.report(force=True)
+
+    def cancel(self):
+        self._cancel_event.set()
+        self._pause_event.set()
+        if self.state == FileJob.STATE_QUEUED and self.manager is not None:
+            self.manager.start_cancelled(self)   # 대기 중이던 작업은 장치 차례를 기다리지 않고 바로 정리
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def is_finished(self):
+        return self.state in FileJob.FINISHED_STATES
+
+    # --- 작업 스레드에서 호출 ---
+    def checkpoint(self):
+        # 항목/버퍼 사이마다 호출: 일시정지 중이면 대기하고, 취소되었으면 예외로 빠져나감
+        self._pause_event.wait()
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def add_progress(self, bytes_count=0, files_count=0):
+        with self._progress_lock:
+            self.bytes_done += bytes_count
+            self.files_done += files_count
+        self.report()
+
+    def bandwidth_buckets(self):
+        if self.manager is not None:
+            return (self.bandwidth, self.manager.bandwidth)
+        return (self.bandwidth,)
+
+    def throttle(self, count):
+        # 실제로 읽고 쓴 바이트만큼 토큰을 쓰고, 한도를 넘었으면 잘게 나눠 대기
+        buckets = self.bandwidth_buckets()
+        for bucket in buckets:
+            bucket.consume(count)
+        while True:
+            wait = max(bucket.wait_time() for bucket in buckets)
+            if wait <= 0:
+                return
+            self.checkpoint()
+            time.sleep(min(wait, self.THROTTLE_SLICE))
+
+    def transfer_chunk_size(self):
+        # 속도 제한 중에는 큰 파일 청크를 약 1초 분량으로 줄여 진행률과 한도 변경이 바로 보이게 함
+        rates = [bucket.rate for bucket in self.bandwidth_buckets() if bucket.rate > 0]
+        if not rates:
+            return self.LARGE_FILE_CHUNK
+        return max(self.COPY_BUFFER_SIZE, min(self.LARGE_FILE_CHUNK, min(rates)))
+
+    def count_transfer(self, cloned=0, copied=0):
+        with self._progress_lock:
+            self.bytes_cloned += cloned
+            self.bytes_copied += copied
+
+    def report(self, force=False):
+        now = time.monotonic()
+        if self.manager is not None and (force or now - self._last_report >= self.REPORT_INTERVAL):
+            self._last_report = now
+            self.manager.job_changed.emit(self)
+
+    def add_error(self, name, error):
+        self.errors.append(f"'{name}': {error}")
+
+    # --- 사전 점검 ---
+    def scan_sources(self, paths):
+        # 병렬 os.scandir 로 전체 크기/파일 수를 구함 (진행률 합계에도 더함). 결과: {원본 경로: SourceScan}
+        self.checkpoint()
+        scans = {}
+        pending = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.SCAN_WORKERS) as pool:
+            for path in paths:
+                scan = SourceScan(path)
+                scans[path] = scan
+                try:
+                    if os.path.isdir(path):
+                        scan.is_dir = True
+                        scan.dirs.append('')
+                        pending[pool.submit(self._scan_dir, path, '')] = (scan, '')
+                    else:
+                        scan.bytes_total = os.path.getsize(path)
+                        scan.files_total = 1
+                except OSError:
+                    scan.complete = False
+            try:
+                while pending:
+                    self.checkpoint()
+                    done, _ = concurrent.futures.wait(pending, timeout=self.REPORT_INTERVAL,
+                                                      return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        scan, rel_dir = pending.pop(future)
+                        try:
+                            sub_dirs, files = future.result()
+                        except OSError:
+                            scan.complete = False
+                            continue
+                        for name, size in files:
+                            scan.files.append((os.path.join(rel_dir, name) if rel_dir else name, size))
+                            scan.bytes_total += size
+                        scan.files_total += len(files)
+                        for name in sub_dirs:
+                            child = os.path.join(rel_dir, name) if rel_dir else name
+                            scan.dirs.append(child)
+                            pending[pool.submit(self._scan_dir, scan.path, child)] = (scan, child)
+                    self.current_item = f"검사 중: 파일 {sum(scan.files_total for scan in scans.values())}개"
+                    self.report()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        self.bytes_total += sum(scan.bytes_total for scan in scans.values())
+        self.files_total += sum(scan.files_total for scan in scans.values())
+        self.report(force=True)
+        return scans
+
+    @staticmethod
+    def _scan_dir(root, rel_dir):
+        sub_dirs, files = [], []
+        with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    sub_dirs.append(entry.name)
+                else:
+                    try:
+                        files.append((entry.name, entry.stat().st_size))
+                    except OSError:
+                        files.append((entry.name, 0))
+        return sub_dirs, files
+
+    def preflight(self, sources):
+        # 쓰기 전에 전체 크기/파일 수와 대상 여유 공간을 비교. 모자라면 사용자에게 계속할지 물음
+        scans = self.scan_sources(sources)
+        if not scans:
+            return scans
+        needed = sum(scan.bytes_total for scan in scans.values())
+        file_count = sum(scan.files_total for scan in scans.values())
+        try:
+            free = shutil.disk_usage(self.destination_folder).free
+        except OSError:
+            return scans
+        self.notes.append(f"사전 점검: 파일 {file_count}개, {format_bytes(needed)} / 대상 여유 공간 {format_bytes(free)}")
+        if needed > free:
+            self.ask_to_continue(f"대상 드라이브의 여유 공간({format_bytes(free)})이 필요한 용량({format_bytes(needed)})보다 적습니다.\n"
+                                 "계속하면 도중에 공간 부족으로 실패할 수 있습니다. (reflink 복제가 되는 드라이브는 예외)")
+        elif needed > free * self.LOW_SPACE_MARGIN:
+            self.notes.append("대상 드라이브 여유 공간이 거의 남지 않습니다.")
+        return scans
+
+    def ask_to_continue(self, message):
+        # 일시정지 상태로 GUI 에 확인을 요청하고, 계속(resume)/취소(cancel) 를 고를 때까지 대기
+        self.attention_message = message
+        self.pause()
+        if self.manager is not None:
+            self.manager.job_attention.emit(self)
+        self.checkpoint()
+        self.attention_message = ""
+
+    def claim_destinations(self):
+        # 이미 대상이 정해진 항목(다시 시도에서 이어 복사할 항목) 뒤에 이어 붙임
+        allocator = NameAllocator(self.destination_folder)
+        for src in self.sources:
+            name = os.path.basename(os.path.normpath(src))
+            existing = os.path.join(self.destination_folder, name)
+            if self.merge and self.can_merge_into(src, existing):
+                self.items.append((src, existing))   # 자리 선점 없이 기존 항목에 병합
+                continue
+            try:
+                dst = os.path.join(self.destination_folder, allocator.claim(name, is_dir=self.placeholder_is_dir(src)))
+            except OSError as e:
+                self.add_error(name, f"대상 이름을 만들 수 없습니다: {e}")
+                continue
+            self.placeholders.add(dst)
+            self.items.append((src, dst))
+
+    def placeholder_is_dir(self, src):
+        # 복사는 폴더 링크를 따라가 실제 폴더를 만듦 (MoveJob 은 링크 자체를 옮기므로 파일 자리)
+        return os.path.isdir(src)
+
+    # --- 병합 (바뀐 파일만 복사) ---
+    @staticmethod
+    def can_merge_into(src, dst):
+        # 종류(폴더/파일)가 같은 다른 항목만. 같은 폴더에 붙여넣으면 평소처럼 새 이름으로 복사
+        try:
+            return (os.path.isdir(src) == os.path.isdir(dst) and not os.path.islink(dst)
+                    and not os.path.samefile(src, dst))
+        except OSError:
+            return False
+
+    def is_unchanged(self, src, dst, src_stat, dst_stat):
+        if src_stat.st_size != dst_stat.st_size:
+            return False
+        if self.compare_hash:
+            return self.hash_file(src).digest() == self.hash_file(dst).digest()
+        return abs(src_stat.st_mtime_ns - dst_stat.st_mtime_ns) <= self.MTIME_TOLERANCE_NS
+
+    def update_file(self, src, dst):
+        # 대상에 같은 파일이 있으면 건너뛰고, 바뀐 파일은 이전 내용을 백업(휴지통)해 실행 취소할 수 있게 한 뒤 복사
+        self.checkpoint()
+        src_stat = os.stat(src)
+        try:
+            dst_stat = os.stat(dst)
+        except FileNotFoundError:
+            dst_stat = None
+        if dst_stat is not None:
+            if self.is_unchanged(src, dst, src_stat, dst_stat):
+                with self._progress_lock:
+                    self.files_skipped += 1
+                self.add_progress(src_stat.st_size, files_count=1)
+                return
+            if min(src_stat.st_size, dst_stat.st_size) >= self.DELTA_MIN_SIZE:
+                self.delta_update(src, dst, src_stat)
+                self.record_undo({'type': 'copy', 'src': src, 'path': dst})
+                return
+            self.backup_before_overwrite(dst)
+        self.mark_partial(dst)
+        self.copy_file(src, dst)
+        self.mark_partial(dst, done=True)
+        self.record_undo({'type': 'copy', 'src': src, 'path': dst})
+
+    def backup_before_overwrite(self, path):
+        try:
+            action = TrashStore.move_to_trash(path)
+        except OSError as e:
+            if e.errno != errno.EXDEV: raise
+            temp_dir = TrashStore.fallback_dir()
+            os.makedirs(temp_dir, exist_ok=True)
+            backup_path = os.path.join(temp_dir, os.path.basename(path) + "_" + str(uuid.uuid4().hex[:8]))
+            shutil.copy2(path, backup_path)
+            os.remove(path)
+            action = {'type': 'delete', 'path': path, 'backup': backup_path}
+        BackupStore.instance().register(action)
+        self.record_undo(action)
+
+    def merge_tree(self, src, dst, scan=None):
+        # 기존 폴더에 없는 하위 폴더는 통째로 복사(실행 취소 항목 하나), 있는 폴더 안의 파일은 하나씩 비교
+        if scan is None or not scan.complete:
+            scan = self.walk_tree(src)
+        def join(base, rel): return os.path.join(base, rel) if rel else base
+        new_dirs = []          # 새로 만든 폴더 중 가장 위 폴더 (상대 경로)
+        new_dir_set = set()
+        all_new_dirs = []
+        for rel_dir in scan.dirs:
+            self.checkpoint()
+            parent = os.path.dirname(rel_dir)
+            if rel_dir and (parent in new_dir_set or not os.path.isdir(join(dst, rel_dir))):
+                if parent not in new_dir_set:
+                    new_dirs.append(rel_dir)
+                    self.mark_partial(join(dst, rel_dir))
+                new_dir_set.add(rel_dir)
+                all_new_dirs.append(rel_dir)
+                os.makedirs(join(dst, rel_dir), exist_ok=self.resume_partial)
+        new_file_pairs, update_pairs = [], []
+        for rel_path, size in scan.files:
+            pair = (os.path.join(src, rel_path), os.path.join(dst, rel_path))
+            (new_file_pairs if os.path.dirname(rel_path) in new_dir_set else update_pairs).append(pair)
+        if self.completed_files:
+            new_file_pairs = self.skip_completed_files(new_file_pairs)
+        self.run_parallel(self.update_file, update_pairs, dst)
+        self.run_parallel(self.copy_file, new_file_pairs, dst)
+        for rel_dir in reversed(all_new_dirs):
+            shutil.copystat(join(src, rel_dir), join(dst, rel_dir))
+        for rel_dir in new_dirs:
+            self.mark_partial(join(dst, rel_dir), done=True)
+            self.record_undo({'type': 'copy', 'src': join(src, rel_dir), 'path': join(dst, rel_dir)})
+
+    # --- 큰 파일 델타 업데이트 (rsync 방식 롤링 체크섬) ---
+    def delta_update(self, src, dst, src_stat):
+        # 기존 대상의 블록 서명을 만들고 원본을 롤링 체크섬으로 훑어, 같은 블록은 기존 파일에서 (가능하면 reflink 로)
+        # 가져오고 바뀐 부분만 원본에서 씀. 임시 파일에 만든 뒤 기존 파일은 백업, 이름 바꾸기로 한 번에 교체
+        self.current_item = f"델타 비교 중: {dst}"
+        temp_path = os.path.join(os.path.dirname(dst), "." + os.path.basename(dst) + self.DELTA_SUFFIX)
+        hasher = hashlib.sha256() if self.verify else None
+        self.mark_partial(temp_path)
+        try:
+            with open(dst, 'rb') as fold:
+                signatures = self.block_signatures(fold)
+                with open(src, 'rb') as fsrc, open(temp_path, 'wb') as fout:
+                    literal_bytes = self.write_delta(fsrc, fold, fout, signatures, hasher)
+                    (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(fout.fileno())
+            shutil.copystat(src, temp_path)
+            self.backup_before_overwrite(dst)
+            os.replace(temp_path, dst)
+        except BaseException:
+            self.discard_partial(temp_path)
+            raise
+        self.mark_partial(temp_path, done=True)
+        self.count_transfer(copied=literal_bytes)
+        self.notes.append(f"'{os.path.basename(dst)}' 델타 업데이트: 바뀐 {format_bytes(literal_bytes)} / 전체 {format_bytes(src_stat.st_size)} 만 원본에서 복사")
+        if self.verify:
+            self.verify_copy(dst, hasher)
+        if self.resume_log is not None:
+            self.resume_log.file_done(dst)
+        self.add_progress(files_count=1)
+
+    def block_signatures(self, fold):
+        # {약한 체크섬(adler32): {강한 체크섬: 기존 파일 오프셋}}
+        signatures = {}
+        offset = 0
+        while True:
+            self.checkpoint()
+            block = fold.read(self.DELTA_BLOCK_SIZE)
+            if len(block) < self.DELTA_BLOCK_SIZE:
+                break   # 마지막 자투리 블록은 원본에서 그대로 씀
+            signatures.setdefault(zlib.adler32(block), {}).setdefault(hashlib.blake2b(block, digest_size=16).digest(), offset)
+            offset += len(block)
+        return signatures
+
+    def write_delta(self, fsrc, fold, fout, signatures, hasher):
+        block_size = self.DELTA_BLOCK_SIZE
+        old_fd, out_fd = fold.fileno(), fout.fileno()
+        buf, buf_start, eof = b"", 0, False
+        pos = literal_start = out_pos = 0
+        match = None          # [기존 파일 오프셋, 길이] 이어지는 일치 블록을 모아서 한 번에 씀
+        weak = None
+        roll_budget = self.DELTA_ROLL_LIMIT
+        literal_bytes = 0
+
+        def flush_match():
+            nonlocal match, out_pos
+            if match is not None:
+                self.copy_old_range(old_fd, out_fd, match[0], out_pos, match[1])
+                out_pos += match[1]
+                match = None
+
+        def flush_literal():
+            nonlocal literal_start, out_pos, literal_bytes
+            if pos > literal_start:
+                flush_match()
+                data = buf[literal_start - buf_start:pos - buf_start]
+                os.pwrite(out_fd, data, out_pos)
+                if hasher is not None: hasher.update(data)
+                out_pos += len(data)
+                literal_bytes += len(data)
+                self.add_progress(len(data))
+                self.throttle(len(data))
+            literal_start = pos
+
+        while True:
+            if not eof and pos + block_size + 1 > buf_start + len(buf):
+                self.checkpoint()
+                flush_literal()
+                data = fsrc.read(self.DELTA_SEGMENT)
+                eof = len(data) < self.DELTA_SEGMENT
+                buf = buf[pos - buf_start:] + data
+                buf_start = pos
+            i = pos - buf_start
+            if i + block_size > len(buf):
+                break
+            if weak is None:
+                weak = zlib.adler32(buf[i:i + block_size])
+            candidates = signatures.get(weak)
+            if candidates:
+                block = buf[i:i + block_size]
+                old_offset = candidates.get(hashlib.blake2b(block, digest_size=16).digest())
+                if old_offset is not None:
+                    flush_literal()
+                    if hasher is not None: hasher.update(block)
+                    if match is not None and match[0] + match[1] == old_offset:
+                        match[1] += block_size
+                    else:
+                        flush_match()
+                        match = [old_offset, block_size]
+                    self.add_progress(block_size)
+                    pos += block_size
+                    literal_start = pos
+                    weak = None
+                    roll_budget = self.DELTA_ROLL_LIMIT
+                    continue
+            if roll_budget > 0 and i + block_size < len(buf):
+                # 한 바이트 밀어 adler32 를 갱신 (삽입/삭제로 어긋난 위치를 다시 찾음)
+                out_byte, in_byte = buf[i], buf[i + block_size]
+                a = ((weak & 0xffff) - out_byte + in_byte) % 65521
+                b = ((weak >> 16) - block_size * out_byte + a - 1) % 65521
+                weak = (b << 16) | a
+                pos += 1
+                roll_budget -= 1
+            else:
+                pos += block_size   # 통째로 바뀐 구간: 블록 단위로만 비교하며 건너뜀
+                weak = None
+        pos = buf_start + len(buf)
+        flush_literal()
+        flush_match()
+        fout.truncate(out_pos)
+        return literal_bytes
+
+    def copy_old_range(self, old_fd, out_fd, old_offset, out_offset, length):
+        # 기존 파일의 일치 구간: 4096 정렬이면 FICLONERANGE 로 블록 공유, 아니면 커널 복사/버퍼 복사
+        if (fcntl is not None and sys.platform.startswith('linux') and not (old_offset | out_offset | length) % 4096):
+            try:
+                fcntl.ioctl(out_fd, self.FICLONERANGE, struct.pack('qQQQ', old_fd, old_offset, length, out_offset))
+                self.count_transfer(cloned=length)
+                return
+            except OSError:
+                pass
+        while length > 0:
+            copied = 0
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    copied = os.copy_file_range(old_fd, out_fd, length, old_offset, out_offset)
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                        raise
+            if not copied:
+                data = os.pread(old_fd, min(length, self.COPY_BUFFER_SIZE), old_offset)
+                if not data:
+                    raise OSError(errno.EIO, "기존 파일 크기가 복사 중에 바뀌었습니다")
+                copied = os.pwrite(out_fd, data, out_offset)
+            old_offset += copied
+            out_offset += copied
+            length -= copied
+
+    def walk_tree(self, src):
+        # 사전 점검 결과가 없거나 불완전할 때: 읽지 못한 폴더는 오류로 알림
+        scan = SourceScan(src)
+        scan.is_dir = True
+        pending = ['']
+        while pending:
+            self.checkpoint()
+            rel_dir = pending.pop()
+            scan.dirs.append(rel_dir)
+            sub_dirs, files = self._scan_dir(src, rel_dir)
+            for name, size in files:
+                scan.files.append((os.path.join(rel_dir, name) if rel_dir else name, size))
+            pending.extend(os.path.join(rel_dir, name) if rel_dir else name for name in reversed(sub_dirs))
+        return scan
+
+    def measure(self, paths):
+        # 진행률 계산을 위한 전체 바이트/파일 수
+        for path in paths:
+            self.checkpoint()
+            if os.path.isdir(path) and not os.path.islink(path):
+                for dir_path, dir_names, file_names in os.walk(path):
+                    self.checkpoint()
+                    for file_name in file_names:
+                        try:
+                            self.bytes_total += os.path.getsize(os.path.join(dir_path, file_name))
+                        except OSError:
+                            pass
+                        self.files_total += 1
+            else:
+                try:
+                    self.bytes_total += os.path.getsize(path)
+                except OSError:
+                    pass
+                self.files_total += 1
+        self.report(force=True)
+
+    @classmethod
+    def copy_workers_for(cls, path):
+        workers = AppSettings.get(cls.COPY_WORKERS_SETTING, {}).get(TrashStore.mount_point(path), cls.DEFAULT_COPY_WORKERS)
+        return max(1, min(int(workers), cls.MAX_COPY_WORKERS))
+
+    @classmethod
+    def set_copy_workers(cls, path, workers):
+        settings = dict(AppSettings.get(cls.COPY_WORKERS_SETTING, {}))
+        settings[TrashStore.mount_point(path)] = int(workers)
+        AppSettings.set(cls.COPY_WORKERS_SETTING, settings)
+
+    def run_parallel(self, func, pairs, destination):
+        # 대상 드라이브별 스레드 수로 func(src, dst) 실행. 취소/오류가 나면 아직 시작하지 않은 항목은 건너뜀
+        workers = min(self.copy_workers_for(destination), len(pairs))
+        if workers <= 1:
+            for src, dst in pairs:
+                func(src, dst)
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, src, dst) for src, dst in pairs]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def copy_file(self, src, dst):
+        self.current_item = src
+        src_stat = os.stat(src)
+        hasher = hashlib.sha256() if self.verify else None
+        if self.try_clone(src, dst, src_stat):
+            hasher = None   # 원본과 같은 블록을 공유하므로 대상 해시만 기록
+            self.count_transfer(cloned=src_stat.st_size)
+            self.add_progress(src_stat.st_size)
+        elif src_stat.st_size >= self.LARGE_FILE_THRESHOLD:
+            hasher = self.copy_large_file(src, dst, src_stat, hasher)
+        else:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                while True:
+                    self.checkpoint()
+                    chunk = fsrc.read(self.COPY_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    fdst.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    self.add_progress(len(chunk))
+                    self.throttle(len(chunk))
+                if hasher is not None:
+                    fdst.flush()
+                    (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(fdst.fileno())
+            self.count_transfer(copied=src_stat.st_size)
+        shutil.copystat(src, dst)
+        if self.verify:
+            self.verify_copy(dst, hasher)
+        if self.resume_log is not None:
+            self.resume_log.file_done(dst)
+        self.add_progress(files_count=1)
+
+    # --- 복사 검증 ---
+    def verify_copy(self, dst, hasher):
+        # 원본은 복사하면서 이미 해시했으므로 대상만 (캐시를 비우고) 다시 읽어 비교
+        self.current_item = f"검증 중: {dst}"
+        dst_digest = self.hash_file(dst, drop_cache=True).hexdigest()
+        src_digest = hasher.hexdigest() if hasher is not None else dst_digest
+        with self._progress_lock:
+            self.manifest.append((src_digest, dst))
+            if dst_digest != src_digest:
+                self.verify_failures.append(dst)
+        if dst_digest != src_digest:
+            raise ChecksumMismatch(errno.EIO, f"체크섬 불일치 (원본 {src_digest[:16]}, 대상 {dst_digest[:16]})", dst)
+
+    def hash_file(self, path, length=None, drop_cache=False):
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            if drop_cache and hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)   # 페이지 캐시가 아닌 디스크 내용을 읽음
+            remaining = length
+            while remaining is None or remaining > 0:
+                self.checkpoint()
+                chunk = f.read(self.COPY_BUFFER_SIZE if remaining is None else min(remaining, self.COPY_BUFFER_SIZE))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+        return hasher
+
+    def write_manifest(self):
+        # sha256sum -c 로 다시 확인할 수 있는 형식 (대상 절대 경로)
+        manifest_dir = get_app_config_path(self.MANIFEST_DIRNAME)
+        os.makedirs(manifest_dir, exist_ok=True)
+        manifest_path = os.path.join(manifest_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-job{self.id}.sha256")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            for digest, path in sorted(self.manifest, key=lambda entry: entry[1]):
+                f.write(f"{digest}  {path}\n")
+        return manifest_path
+
+    def try_clone(self, src, dst, src_stat):
+        # Btrfs/XFS 등에서 FICLONE 으로 블록을 공유하는 즉시 복제. 안 되면 False 를 돌려 파일별로 일반 복사
+        if fcntl is None or not sys.platform.startswith('linux') or src_stat.st_size == 0:
+            return False
+        if os.path.exists(self.resume_info_path(dst)):
+            return False   # 이어받을 부분 파일을 덮어쓰지 않음
+        try:
+            device_pair = (src_stat.st_dev, os.stat(os.path.dirname(dst)).st_dev)
+        except OSError:
+            return False
+        if device_pair in FileJob._clone_unsupported:
+            return False
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), self.FICLONE, fsrc.fileno())
+        except OSError as e:
+            if e.errno in self.CLONE_UNSUPPORTED_ERRNOS:
+                FileJob._clone_unsupported.add(device_pair)
+            return False
+        return True
+
+    def transfer_summary(self):
+        if not self.bytes_cloned:
+            return ""
+        return f"reflink 복제 {format_bytes(self.bytes_cloned)}, 실제 복사 {format_bytes(self.bytes_copied)}"
+
+    # --- 큰 파일: 커널 복사 + 청크 단위 이어받기 ---
+    @classmethod
+    def resume_info_path(cls, dst):
+        return os.path.join(os.path.dirname(dst), "." + os.path.basename(dst) + cls.RESUME_SUFFIX)
+
+    def copy_large_file(self, src, dst, src_stat, hasher=None):
+        # 청크마다 디스크에 내려쓴 뒤 오프셋을 기록. 입출력 오류는 마지막으로 확인된 위치부터 다시 시도
+        # 검증 중이면 이어받은 앞부분만 원본에서 해시하고 나머지는 복사하면서 해시. 최종 해시 객체를 돌려줌
+        resume_path = self.resume_info_path(dst)
+        offset = self.verified_resume_offset(src, dst, src_stat, resume_path)
+        reported = offset
+        self.add_progress(offset)
+        attempts = 0
+        while True:
+            if hasher is not None:
+                hasher = self.hash_file(src, offset) if offset else hashlib.sha256()
+            try:
+                for offset in self.transfer_chunks(src, dst, src_stat, resume_path, offset, hasher):
+                    self.count_transfer(copied=offset - reported)
+                    self.add_progress(offset - reported)
+                    self.throttle(offset - reported)
+                    reported = offset
+                break
+            except OSError:
+                attempts += 1
+                if attempts > self.LARGE_FILE_RETRIES:
+                    raise
+                time.sleep(attempts)
+                self.checkpoint()
+                offset = self.verified_resume_offset(src, dst, src_stat, resume_path)
+                self.add_progress(offset - reported)
+                reported = offset
+        if os.path.exists(resume_path):
+            os.remove(resume_path)
+        return hasher
+
+    def transfer_chunks(self, src, dst, src_stat, resume_path, offset, hasher=None):
+        size = src_stat.st_size
+        with open(src, 'rb') as fsrc, open(dst, 'r+b' if offset else 'wb') as fdst:
+            fdst.truncate(offset)
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            method = 'copy_file_range' if hasattr(os, 'copy_file_range') else 'sendfile' if sys.platform.startswith('linux') else 'buffered'
+            if hasher is not None:
+                method = 'buffered'   # 데이터가 버퍼를 지나가야 해시할 수 있음
+            while offset < size:
+                self.checkpoint()
+                count = min(self.transfer_chunk_size(), size - offset)
+                chunk_end = offset + count
+                while offset < chunk_end:
+                    copied, method = self.copy_range(fsrc, fdst, in_fd, out_fd, offset, chunk_end - offset, method, hasher)
+                    if copied == 0:
+                        raise OSError(errno.EIO, "원본 파일 크기가 복사 중에 바뀌었습니다", src)
+                    offset += copied
+                fdst.flush()
+                (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(out_fd)
+                self.write_resume_info(resume_path, src, src_stat, offset)
+                yield offset
+
+    @staticmethod
+    def copy_range(fsrc, fdst, in_fd, out_fd, offset, count, method, hasher=None):
+        # (복사한 바이트, 다음에 쓸 방식). 파일 시스템이 지원하지 않으면 다음 방식으로 내려감
+        if method == 'copy_file_range':
+            try:
+                return os.copy_file_range(in_fd, out_fd, count, offset, offset), method
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                    raise
+                method = 'sendfile'
+        if method == 'sendfile':
+            try:
+                os.lseek(out_fd, offset, os.SEEK_SET)
+                return os.sendfile(out_fd, in_fd, offset, count), method
+            except OSError as e:
+                if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                method = 'buffered'
+        fsrc.seek(offset)
+        chunk = fsrc.read(min(count, FileJob.COPY_BUFFER_SIZE))
+        fdst.seek(offset)
+        fdst.write(chunk)
+        if hasher is not None:
+            hasher.update(chunk)
+        return len(chunk), method
+
+    @staticmethod
+    def write_resume_info(resume_path, src, src_stat, offset):
+        created = not os.path.exists(resume_path)
+        with open(resume_path, 'w', encoding='utf-8') as f:
+            json.dump({'src': src, 'size': src_stat.st_size, 'mtime_ns': src_stat.st_mtime_ns, 'offset': offset}, f)
+        if created and os.name == 'nt':
+            ctypes.windll.kernel32.SetFileAttributesW(resume_path, FILE_ATTRIBUTE_HIDDEN)
+
+    def verified_resume_offset(self, src, dst, src_stat, resume_path):
+        # 같은 원본(크기/수정 시각)에 대한 기록이고, 기록된 위치 바로 앞 블록이 원본과 같을 때만 이어받음
+        try:
+            with open(resume_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            offset = int(info['offset'])
+            if (info['src'] != src or info['size'] != src_stat.st_size or info['mtime_ns'] != src_stat.st_mtime_ns
+                    or not 0 < offset <= src_stat.st_size or os.path.getsize(dst) < offset):
+                return 0
+            block = min(offset, self.COPY_BUFFER_SIZE)
+            with open(src, 'rb') as fsrc, open(dst, 'rb') as fdst:
+                fsrc.seek(offset - block)
+                fdst.seek(offset - block)
+                if fsrc.read(block) != fdst.read(block):
+                    return 0
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+        self.notes.append(f"'{os.path.basename(dst)}' 은(는) {format_bytes(offset)} 지점부터 이어서 복사했습니다.")
+        return offset
+
+    def discard_partial(self, dst, keep_resumable=False):
+        # 취소/실패한 대상 정리. keep_resumable 이면 이어받기 정보가 있는 큰 파일은 남겨 '다시 시도' 때 이어서 복사
+        resume_path = self.resume_info_path(dst)
+        if keep_resumable and os.path.exists(resume_path):
+            return
+        self.remove_item(dst)
+        if os.path.exists(resume_path):
+            os.remove(resume_path)
+
+    def make_retry_job(self):
+        # 실패/취소 후 '다시 시도': 끝나지 않은 항목만 같은 종류의 새 작업으로
+        return None
+
+    def remove_unused_placeholders(self):
+        # 취소/오류로 쓰이지 않은 선점 자리는 비어 있을 때만 지움
+        used = {action.get('path') for action in self.undo_actions} | {action.get('dst') for action in self.undo_actions}
+        for path in self.placeholders - used:
+            self.release_placeholder(path)
+
+    def release_placeholder(self, path):
+        # 실패한 항목의 선점 자리는 바로 비움 (비어 있을 때만, 이미 무언가 쓰였으면 그대로)
+        if path not in self.placeholders: return
+        self.placeholders.discard(path)
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                os.rmdir(path)
+            elif os.path.isfile(path) and not os.path.islink(path) and os.path.getsize(path) == 0:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def retry_items(self, items):
+        # '다시 시도' 항목 나누기: 이어받기 정보가 남은 대상은 그 자리에서 이어 복사하고,
+        # 나머지는 이름을 다시 배정 (취소로 비운 자리를 그 사이 다른 파일이 차지했을 수 있음)
+        resumable = [(src, dst) for src, dst in items if os.path.exists(self.resume_info_path(dst))]
+        reclaim = [(src, dst) for src, dst in items if not os.path.exists(self.resume_info_path(dst))]
+        return resumable, reclaim
+
+    def make_retry_job_of(self, job_class, items):
+        resumable, reclaim = self.retry_items(items)
+        job = job_class(resumable, self.title)
+        job.resume_partial = True
+        job.verify = self.verify
+        if reclaim:
+            # 원래 붙여넣기/드롭 작업이므로 대상 폴더는 하나
+            job.sources = [src for src, dst in reclaim]
+            job.destination_folder = os.path.dirname(reclaim[0][1])
+        return job
+
+    def copy_tree(self, src, dst, scan=None):
+        # scandir 로 트리를 먼저 훑으며 폴더를 모두 만들고, 파일은 스레드 풀로 복사
+        # (사전 점검 결과가 있으면 다시 훑지 않고 그 목록을 사용)
+        dir_pairs = []
+        file_pairs = []
+        pending = [] if scan is not None and scan.complete else [(src, dst)]
+        if not pending:
+            def join(base, rel): return os.path.join(base, rel) if rel else base
+            for rel_dir in scan.dirs:
+                self.checkpoint()
+                os.makedirs(join(dst, rel_dir), exist_ok=self.resume_partial or join(dst, rel_dir) in self.placeholders)
+                dir_pairs.append((join(src, rel_dir), join(dst, rel_dir)))
+            file_pairs = [(os.path.join(src, rel_path), os.path.join(dst, rel_path)) for rel_path, size in scan.files]
+        while pending:
+            src_dir, dst_dir = pending.pop()
+            self.checkpoint()
+            os.makedirs(dst_dir, exist_ok=self.resume_partial or dst_dir in self.placeholders)
+            dir_pairs.append((src_dir, dst_dir))
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    target = os.path.join(dst_dir, entry.name)
+                    if entry.is_dir():
+                        pending.append((entry.path, target))
+                    else:
+                        file_pairs.append((entry.path, target))
+        if self.completed_files:
+            file_pairs = self.skip_completed_files(file_pairs)
+        self.run_parallel(self.copy_file, file_pairs, dst)
+        # 폴더 시간 정보는 안의 파일을 다 쓴 뒤 하위 폴더부터
+        for src_dir, dst_dir in reversed(dir_pairs):
+            shutil.copystat(src_dir, dst_dir)
+
+    def skip_completed_files(self, file_pairs):
+        # 재시작 전에 끝난 파일은 크기가 같으면 다시 복사하지 않음
+        remaining = []
+        skipped = 0
+        for src_file, dst_file in file_pairs:
+            try:
+                size = os.path.getsize(src_file)
+                if dst_file in self.completed_files and os.path.getsize(dst_file) == size:
+                    self.add_progress(size, files_count=1)
+                    skipped += 1
+                    continue
+            except OSError:
+                pass
+            remaining.append((src_file, dst_file))
+        if skipped:
+            self.notes.append(f"이전 실행에서 복사를 끝낸 파일 {skipped}개는 건너뛰었습니다.")
+        return remaining
+
+    def open_resume_log(self):
+        # 계획이 정해진 뒤 (이름 배정 후) 재시작용 기록을 시작
+        if self.checkpoint_kind and self.items:
+            self.resume_log = JobCheckpointLog.create(self)
+
+    def copy_item(self, src, dst, scan=None):
+        self.mark_partial(dst)
+        if os.path.isdir(src):
+            self.copy_tree(src, dst, scan)
+        else:
+            self.copy_file(src, dst)
+        self.mark_partial(dst, done=True)
+
+    def record_undo(self, action):
+        self.undo_actions.append(action)
+        if self.journal_group is not None:
+            OperationJournal.instance().record(action, self.journal_group)
+        if self.resume_log is not None:
+            self.resume_log.item_done(OperationJournal.action_target(action))
+
+    def mark_partial(self, path, done=False):
+        # 비정상 종료 시 복구 단계에서 지울 수 있도록 복사 중인 대상 경로를 저널에 남김
+        if self.journal_group is not None:
+            OperationJournal.instance().mark_partial(self.journal_group, path, done)
+
+    def remove_tree(self, path, report=True, cancellable=True):
+        # 큰 폴더 트리 삭제 (delete_tree 엔진). report: 지운 파일 수를 진행률에 반영,
+        # cancellable: 일시정지/취소를 받음. 원본 정리처럼 중간에 멈추면 안 되는 곳은 False
+        checkpoint = self.checkpoint if cancellable else None
+        if not report:
+            self.delete_tree(path, checkpoint)
+            return
+        def on_listed(dir_path, count):
+            self.files_total += count
+            self.current_item = f"삭제 중: {dir_path}"
+        self.delete_tree(path, checkpoint, on_listed, lambda count: self.add_progress(files_count=count))
+
+    @classmethod
+    def delete_tree(cls, path, checkpoint=None, on_listed=None, on_removed=None):
+        # scandir 로 훑으며 파일은 폴더 fd 기준으로 스레드 풀에서 unlink, 폴더는 하위부터 rmdir.
+        # 열거나 지우지 못한 항목은 모아 두었다가 끝에 한 번에 알림 (나머지는 계속 지움).
+        # 정션 등 재분석 지점은 shutil.rmtree 처럼 들어가지 않고 링크만 지움 (대상 폴더의 파일을 지우지 않도록)
+        top_stat = os.lstat(path)
+        if is_reparse_point(top_stat) or os.path.islink(path) or not os.path.isdir(path):
+            if is_reparse_point(top_stat): remove_reparse_point(path)
+            else: os.remove(path)
+            if on_listed: on_listed(path, 1)
+            if on_removed: on_removed(1)
+            return
+        dirs = []
+        failed = []
+        futures = set()
+        def collect(done):
+            for future in done:
+                failed.extend(future.result())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=cls.DELETE_WORKERS) as pool:
+            try:
+                pending = [path]
+                while pending:
+                    if checkpoint: checkpoint()
+                    dir_path = pending.pop()
+                    names = []
+                    links = []
+                    try:
+                        with os.scandir(dir_path) as entries:
+                            for entry in entries:
+                                if is_reparse_entry(entry): links.append(entry.path)
+                                elif entry.is_dir(follow_symlinks=False): pending.append(entry.path)
+                                else: names.append(entry.name)
+                    except FileNotFoundError:
+                        continue   # 다른 곳에서 이미 지움
+                    except OSError as e:
+                        failed.append((dir_path, e))
+                        continue
+                    dirs.append(dir_path)
+                    if on_listed: on_listed(dir_path, len(names) + len(links))
+                    for link_path in links:
+                        try:
+                            remove_reparse_point(link_path)
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            failed.append((link_path, e))
+                    if links and on_removed: on_removed(len(links))
+                    for start in range(0, len(names), cls.DELETE_BATCH):
+                        futures.add(pool.submit(cls._unlink_batch, dir_path, names[start:start + cls.DELETE_BATCH], checkpoint, on_removed))
+                    # 훑는 쪽이 너무 앞서 나가 대기 목록이 커지지 않게 함
+                    while len(futures) > cls.DELETE_WORKERS * 4:
+                        done, futures = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                        collect(done)
+                done, futures = concurrent.futures.wait(futures)
+                collect(done)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        for dir_path in reversed(dirs):
+            if checkpoint: checkpoint()
+            try:
+                os.rmdir(dir_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                failed.append((dir_path, e))
+        if failed:
+            first_path, first_error = failed[0]
+            raise OSError(first_error.errno, f"{len(failed)}개 항목을 지우지 못했습니다 (첫 항목: {first_path}: {first_error.strerror})", path)
+
+    @staticmethod
+    def _unlink_batch(dir_path, names, checkpoint, on_removed):
+        if checkpoint: checkpoint()
+        failed = []
+        dir_fd = None
+        try:
+            if os.unlink in os.supports_dir_fd:
+                dir_fd = os.open(dir_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            for name in names:
+                try:
+                    if dir_fd is not None: os.unlink(name, dir_fd=dir_fd)
+                    else: os.remove(os.path.join(dir_path, name))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    failed.append((os.path.join(dir_path, name), e))
+        except FileNotFoundError:
+            pass   # 폴더째 다른 곳에서 지움
+        except OSError as e:
+            failed.append((dir_path, e))
+        finally:
+            if dir_fd is not None: os.close(dir_fd)
+        if on_removed:
+            on_removed(len(names))
+        return failed
+
+    @staticmethod
+    def remove_item(path):
+        # 정리용 삭제 (진행률/취소 없음). 폴더는 delete_tree 병렬 엔진으로
+        if os.path.isdir(path) and not os.path.islink(path):
+            FileJob.delete_tree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+    # --- 표시 ---
+    def elapsed_seconds(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at or time.monotonic()
+        paused = self._paused_seconds + (time.monotonic() - self._paused_at if self._paused_at else 0.0)
+        return max(0.0, end - self.started_at - paused)
+
+    def eta_seconds(self):
+        elapsed = self.elapsed_seconds()
+        if self.bytes_done <= 0 or self.bytes_total <= self.bytes_done or elapsed <= 0:
+            return None
+        return elapsed * (self.bytes_total - self.bytes_done) / self.bytes_done
+
+    def progress_fraction(self):
+        if self.bytes_total > 0:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total > 0:
+            return min(1.0, self.files_done / self.files_total)
+        return 1.0 if self.state == FileJob.STATE_DONE else 0.0
+
+    def progress_text(self):
+        text = f"{self.files_done}/{self.files_total}개, {format_bytes(self.bytes_done)} / {format_bytes(self.bytes_total)}"
+        if self.bytes_cloned:
+            text += f" ({self.transfer_summary()})"
+        eta = self.eta_seconds()
+        if eta is not None and self.state == FileJob.STATE_RUNNING:
+            text += f", 남은 시간 {format_seconds(eta)}"
+        return text
+
+    def run(self):
+        raise NotImplementedError
+
+
+class CopyJob(FileJob):
+    checkpoint_kind = 'copy'
+
+    def __init__(self, items, title="복사"):
+        super().__init__(title)
+        self.items = items         # [(원본 경로, 대상 경로), ...]
+
+    def run(self):
+        if self.destination_folder is not None:
+            scans = self.preflight(self.sources)
+            self.claim_destinations()
+        else:
+            scans = self.scan_sources([src for src, dst in self.items])
+        self.open_resume_log()
+        # 낱개 파일들은 한꺼번에 스레드 풀로, 폴더는 하나씩 (폴더 안의 파일은 다시 병렬)
+        file_items = [(src, dst) for src, dst in self.items if not os.path.isdir(src)]
+        dir_items = [(src, dst) for src, dst in self.items if os.path.isdir(src)]
+        if file_items:
+            self.run_parallel(self.copy_one, file_items, file_items[0][1])
+        for src, dst in dir_items:
+            self.copy_one(src, dst, scans.get(src))
+        if self.merge:
+            self.notes.append(f"병합: 바뀌지 않은 파일 {self.files_skipped}개 건너뜀, 새로 복사하거나 바꾼 파일 {self.files_done - self.files_skipped}개")
+
+    def copy_one(self, src, dst, scan=None):
+        self.checkpoint()
+        self.current_item = src
+        if self.merge and dst not in self.placeholders and os.path.lexists(dst):
+            self.merge_one(src, dst, scan)
+            return
+        try:
+            self.copy_item(src, dst, scan)
+            self.record_undo({'type': 'copy', 'src': src, 'path': dst})
+        except JobCancelled:
+            # 복사 중이던 항목은 남기지 않음
+            self.discard_partial(dst)
+            raise
+        except Exception as e:
+            self.add_error(os.path.basename(src), e)
+            self.release_placeholder(dst)
+
+    def merge_one(self, src, dst, scan=None):
+        try:
+            if os.path.isdir(src):
+                self.merge_tree(src, dst, scan)
+            else:
+                self.update_file(src, dst)
+            if self.resume_log is not None:
+                self.resume_log.item_done(dst)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            self.add_error(os.path.basename(src), e)
+
+    def make_retry_job(self):
+        copied = {action['path'] for action in self.undo_actions}
+        items = [(src, dst) for src, dst in self.items if dst not in copied or self.merge]
+        if not items: return None
+        job = self.make_retry_job_of(CopyJob, items)
+        job.merge = self.merge
+        job.compare_hash = self.compare_hash
+        return job
+
+
+class MoveJob(FileJob):
+    checkpoint_kind = 'move'
+    ROUTE_RENAME = "이름 변경"
+    ROUTE_COPY = "복사 후 삭제"
+
+    def __init__(self, items, title="이동"):
+        super().__init__(title)
+        self.items = items         # [(원본 경로, 대상 경로), ...]
+        self.item_routes = []      # [(원본 이름, 처리 방식)] 작업 목록에 항목별로 표시
+
+    @staticmethod
+    def plan(items):
+        # 원본과 대상 폴더의 st_dev 를 먼저 비교해 (이름 변경할 항목, 복사 후 삭제할 항목) 으로 나눔
+        rename_items, copy_items = [], []
+        device_cache = {}
+        for src, dst in items:
+            dst_dir = os.path.dirname(dst)
+            try:
+                if dst_dir not in device_cache:
+                    device_cache[dst_dir] = os.stat(dst_dir).st_dev
+                same_device = os.lstat(src).st_dev == device_cache[dst_dir]
+            except OSError:
+                same_device = True   # 상태를 알 수 없으면 이름 변경을 시도해 실제 오류를 보고
+            (rename_items if same_device else copy_items).append((src, dst))
+        return rename_items, copy_items
+
+    def set_route(self, src, route):
+        self.item_routes.append((os.path.basename(src), route))
+
+    def placeholder_is_dir(self, src):
+        # 이름 변경은 폴더 링크도 링크 자체를 옮기므로 파일 자리를 선점
+        return os.path.isdir(src) and not os.path.islink(src)
+
+    def run(self):
+        scans = {}
+        if self.destination_folder is not None:
+            # 이름 변경으로 끝날 항목은 공간이 필요 없으므로 다른 장치 항목만 사전 점검
+            provisional_items = [(src, os.path.join(self.destination_folder, os.path.basename(os.path.normpath(src))))
+                                 for src in self.sources]
+            scans = self.preflight([src for src, dst in self.plan(provisional_items)[1]])
+            self.claim_destinations()
+        self.open_resume_log()
+        # 같은 장치 항목은 한 번에 os.rename 으로 끝내고, 실제로 다른 장치인 항목만 복사 엔진으로
+        rename_items, cross_device_items = self.plan(self.items)
+        self.files_total += len(rename_items)
+        for src, dst in rename_items:
+            self.checkpoint()
+            self.current_item = src
+            try:
+                if dst in self.placeholders and os.name == 'nt':
+                    os.rmdir(dst) if os.path.isdir(dst) else os.remove(dst)   # 윈도우 rename 은 대상을 덮어쓰지 않음
+                os.rename(src, dst)
+            except OSError as e:
+                if e.errno == errno.EXDEV:
+                    # 같은 파일 시스템이라도 바인드 마운트 경계는 이름 변경이 안 됨
+                    self.files_total -= 1
+                    cross_device_items.append((src, dst))
+                else:
+                    # 대상이 이미 있는 폴더 등은 복사로 바꾸지 않고 오류로 알림
+                    self.add_error(os.path.basename(src), e)
+                    self.add_progress(files_count=1)
+                    self.release_placeholder(dst)
+                continue
+            self.record_undo({'type': 'move', 'src': src, 'dst': dst})
+            self.set_route(src, self.ROUTE_RENAME)
+            self.add_progress(files_count=1)
+        renamed_count = len(self.item_routes)
+        if cross_device_items:
+            self.notes.append(f"{len(cross_device_items)}개 항목은 다른 드라이브라서 복사 후 삭제했습니다.")
+        if renamed_count:
+            self.notes.append(f"{renamed_count}개 항목은 이름 변경으로 바로 이동했습니다.")
+        if not cross_device_items:
+            return
+        scans.update(self.scan_sources([src for src, dst in cross_device_items if src not in scans]))
+        for src, dst in cross_device_items:
+            self.checkpoint()
+            self.current_item = src
+            try:
+                if dst in self.placeholders and os.path.isdir(src) and os.path.isfile(dst):
+                    os.remove(dst)   # 폴더 링크: 이름 변경용 파일 자리 대신 따라간 폴더를 복사
+                self.copy_item(src, dst, scans.get(src))
+            except JobCancelled:
+                self.discard_partial(dst)
+                raise
+            except Exception as e:
+                self.discard_partial(dst, keep_resumable=True)
+                self.add_error(os.path.basename(src), e)
+                self.release_placeholder(dst)
+                continue
+            try:
+                self.remove_tree(src, report=False, cancellable=False)
+            except Exception as e:
+                self.add_error(os.path.basename(src), f"원본 삭제 실패: {e}")
+            self.record_undo({'type': 'move', 'src': src, 'dst': dst})
+            self.set_route(src, self.ROUTE_COPY)
+
+    def make_retry_job(self):
+        moved = {action['dst'] for action in self.undo_actions}
+        items = [(src, dst) for src, dst in self.items if dst not in moved and os.path.lexists(src)]
+        if not items: return None
+        return self.make_retry_job_of(MoveJob, items)
+
+
+class DeleteJob(FileJob):
+    def __init__(self, paths, title="삭제"):
+        super().__init__(title)
+        self.paths = paths
+
+    def io_paths(self):
+        return list(self.paths)
+
+    def run(self):
+        # 항목마다 같은 볼륨 휴지통으로 이름 변경 한 번. 다른 볼륨인 항목만 복사 백업 후 삭제
+        self.files_total = len(self.paths)
+        copy_fallback_paths = []
+        for path in self.paths:
+            self.checkpoint()
+            self.current_item = path
+            try:
+                action = TrashStore.move_to_trash(path)
+                self.record_undo(action)
+                BackupStore.instance().register(action)
+                self.add_progress(files_count=1)
+            except OSError as e:
+                if e.errno == errno.EXDEV:
+                    copy_fallback_paths.append(path)
+                else:
+                    self.add_error(os.path.basename(path), e)
+        if copy_fallback_paths:
+            self.notes.append(f"{len(copy_fallback_paths)}개 항목은 같은 볼륨에 휴지통을 만들 수 없어 복사 백업 후 삭제했습니다.")
+            self.delete_with_copy_backup(copy_fallback_paths)
+
+    def delete_with_copy_backup(self, paths):
+        self.measure(paths)
+        self.files_total -= len(paths)
+        temp_dir = TrashStore.fallback_dir()
+        os.makedirs(temp_dir, exist_ok=True)
+        for path in paths:
+            self.checkpoint()
+            self.current_item = path
+            backup_path = os.path.join(temp_dir, os.path.basename(path) + "_" + str(uuid.uuid4().hex[:8]))
+            try:
+                self.copy_item(path, backup_path)
+            except JobCancelled:
+                self.remove_item(backup_path)
+                raise
+            except Exception as e:
+                self.remove_item(backup_path)
+                self.add_error(os.path.basename(path), e)
+                continue
+            try:
+                self.remove_tree(path, report=False, cancellable=False)
+                action = {'type': 'delete', 'path': path, 'backup': backup_path}
+                self.record_undo(action)
+                BackupStore.instance().register(action)
+            except Exception as e:
+                self.add_error(os.path.basename(path), e)
+
+
+class PurgeJob(FileJob):
+    # 영구 삭제 (휴지통/백업 없이). 되돌릴 수 없으므로 작업 저널에 남기지 않음
+    journaled = False
+
+    def __init__(self, paths, title="영구 삭제"):
+        super().__init__(title)
+        self.paths = paths
+
+    def io_paths(self):
+        return list(self.paths)
+
+    def run(self):
+        for path in self.paths:
+            self.checkpoint()
+            self.current_item = path
+            try:
+                self.remove_tree(path)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                self.add_error(os.path.basename(path), e)
+
+
+class FileJobManager(QObject):
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+    job_attention = pyqtSignal(object)   # 사전 점검에서 사용자 확인이 필요할 때 (작업은 일시정지 상태)
+    queue_changed = pyqtSignal()         # 대기열 순서/우선순위 변경
+
+    BANDWIDTH_SETTING = "global_bandwidth_limit"   # 초당 바이트, 0 = 제한 없음
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = FileJobManager()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = []
+        self.pending = []           # 장치 차례를 기다리는 작업 (우선순위가 같으면 이 순서대로)
+        self.device_holders = {}    # 실행 중인 작업 -> 사용 중인 장치. GUI 스레드에서만 변경
+        self.bandwidth = TokenBucket(AppSettings.get(self.BANDWIDTH_SETTING, 0))   # 모든 작업에 함께 적용
+        self.job_finished.connect(self._on_job_finished)
+
+    def set_global_bandwidth(self, rate):
+        self.bandwidth.set_rate(rate)
+        AppSettings.set(self.BANDWIDTH_SETTING, self.bandwidth.rate)
+
+    def submit(self, job):
+        # 같은 장치(HDD 등)를 쓰는 작업은 한 번에 하나씩, 서로 다른 장치의 작업은 동시에 실행
+        job.manager = self
+        job.devices = self.devices_for(job.io_paths())
+        self.jobs.append(job)
+        self.pending.append(job)
+        self.job_added.emit(job)
+        self.schedule()
+        return job
+
+    @staticmethod
+    def devices_for(paths):
+        devices = set()
+        checked_dirs = set()
+        for path in paths:
+            probe = path
+            while True:
+                try:
+                    devices.add(os.lstat(probe).st_dev)
+                    break
+                except OSError:
+                    parent = os.path.dirname(probe)
+                    if parent == probe or parent in checked_dirs:
+                        break
+                    checked_dirs.add(parent)
+                    probe = parent
+        return frozenset(devices)
+
+    def queued_jobs(self):
+        return sorted(self.pending, key=lambda job: -job.priority)
+
+    def schedule(self):
+        # 앞선 대기 작업이 기다리는 장치는 뒤 작업도 추월하지 않음 (우선순위/순서 보장)
+        blocked = set().union(*self.device_holders.values())
+        for job in self.queued_jobs():
+            if job.devices & blocked:
+                blocked |= job.devices
+                continue
+            blocked |= job.devices
+            self.pending.remove(job)
+            self.device_holders[job] = job.devices
+            self._start_worker(job)
+        self.queue_changed.emit()
+
+    def start_cancelled(self, job):
+        # 대기 중에 취소된 작업: 장치를 잡지 않고 바로 실행해 첫 checkpoint 에서 정리되게 함
+        if job in self.pending:
+            self.pending.remove(job)
+            self._start_worker(job)
+            self.queue_changed.emit()
+
+    def _start_worker(self, job):
+        job.state = FileJob.STATE_RUNNING
+        worker = threading.Thread(target=self._run_job, args=(job,), daemon=True)
+        worker.start()
+
+    def set_priority(self, job, priority):
+        if job.priority == priority: return
+        job.priority = priority
+        self.schedule()
+
+    def move_in_queue(self, job, step):
+        # 대기열에서 한 칸 앞(-1)/뒤(+1)로. 우선순위가 다른 작업을 넘으면 그 우선순위를 따름
+        queue = self.queued_jobs()
+        if job not in queue: return
+        index = queue.index(job)
+        if not 0 <= index + step < len(queue): return
+        neighbor = queue[index + step]
+        job.priority = neighbor.priority
+        a, b = self.pending.index(job), self.pending.index(neighbor)
+        self.pending[a], self.pending[b] = neighbor, job
+        self.schedule()
+
+    def _run_job(self, job):
+        job.started_at = time.monotonic()
+        job.report(force=True)
+        journal = OperationJournal.instance()
+        if job.journaled:
+            job.journal_group = journal.begin_group(job.title)
+        try:
+            job.run()
+            job.state = FileJob.STATE_DONE
+        except JobCancelled:
+            job.state = FileJob.STATE_CANCELLED
+        except Exception as e:
+            job.add_error(job.title, e)
+            job.state = FileJob.STATE_FAILED
+        if job.placeholders:
+            job.remove_unused_placeholders()
+        if job.bytes_cloned:
+            job.notes.append(job.transfer_summary())
+        if job.manifest:
+            try:
+                manifest_path = job.write_manifest()
+                job.notes.append(f"검증: {len(job.manifest) - len(job.verify_failures)}/{len(job.manifest)}개 파일 일치, 목록: {manifest_path}")
+            except OSError as e:
+                job.add_error("검증 목록", e)
+        if job.verify_failures and job.state == FileJob.STATE_DONE:
+            job.state = FileJob.STATE_FAILED
+        # 취소/실패해도 끝난 항목은 실행 취소할 수 있도록 확정 (작업 하나 = 트랜잭션 하나)
+        if job.journal_group is not None:
+            journal.end_group(job.journal_group)
+        if job.resume_log is not None:
+            job.resume_log.close()   # 정상적으로 끝난 작업 (취소/실패 포함) 은 재시작 때 다시 묻지 않음
+        job.finished_at = time.monotonic()
+        job.current_item = ""
+        self.job_finished.emit(job)
+
+    def _on_job_finished(self, job):
+        if self.device_holders.pop(job, None) is not None:
+            self.schedule()
+        if job.on_commit is not None:
+            try:
+                job.on_commit(job)
+            except RuntimeError as e:
+                print(f"작업 완료 처리 오류 ({job.title}): {e}")
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.is_finished()]
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if not job.is_finished()]
+
+
+class FileJobRowWidget(QFrame):
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.setFrameShape(QFrame.StyledPanel)
+        layout = QGridLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label, 0, 0)
+        self.pause_button = QPushButton("일시정지")
+        self.pause_button.clicked.connect(self.toggle_pause)
+        layout.addWidget(self.pause_button, 0, 1)
+        self.cancel_button = QPushButton("취소")
+        self.cancel_button.clicked.connect(job.cancel)
+        layout.addWidget(self.cancel_button, 0, 2)
+        self.retry_button = QPushButton("다시 시도")
+        self.retry_button.setToolTip("끝나지 않은 항목만 다시 복사/이동합니다. 큰 파일은 중단된 위치부터 이어서 복사합니다.")
+        self.retry_button.clicked.connect(self.retry_job)
+        layout.addWidget(self.retry_button, 0, 3)
+        self.limit_button = QPushButton("속도 제한")
+        self.limit_button.setToolTip("이 작업의 최대 복사 속도를 정합니다. 실행 중에도 바로 적용됩니다.")
+        self.limit_button.clicked.connect(self.configure_bandwidth)
+        layout.addWidget(self.limit_button, 0, 4)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        layout.addWidget(self.progress_bar, 1, 0, 1, 5)
+        self.detail_label = QLabel()
+        self.detail_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.detail_label, 2, 0, 1, 5)
+        # 대기 중인 작업의 우선순위/순서 조정
+        self.queue_controls = QWidget()
+        queue_layout = QHBoxLayout(self.queue_controls)
+        queue_layout.setContentsMargins(0, 0, 0, 0)
+        queue_layout.addWidget(QLabel("우선순위:"))
+        self.priority_combo = QComboBox()
+        for priority, label in FileJob.PRIORITY_LABELS:
+            self.priority_combo.addItem(label, priority)
+        self.priority_combo.activated.connect(self.change_priority)
+        queue_layout.addWidget(self.priority_combo)
+        move_up_button = QPushButton("▲ 앞으로")
+        move_up_button.clicked.connect(lambda: FileJobManager.instance().move_in_queue(self.job, -1))
+        queue_layout.addWidget(move_up_button)
+        move_down_button = QPushButton("▼ 뒤로")
+        move_down_button.clicked.connect(lambda: FileJobManager.instance().move_in_queue(self.job, 1))
+        queue_layout.addWidget(move_down_button)
+        queue_layout.addStretch(1)
+        layout.addWidget(self.queue_controls, 3, 0, 1, 5)
+        self.retried = False
+        self.update_from_job()
+
+    def configure_bandwidth(self):
+        limit_mb, ok = QInputDialog.getDouble(
+            self, "속도 제한", "이 작업의 최대 속도 (MB/s, 0 = 제한 없음):",
+            self.job.bandwidth.rate / (1024 * 1024), 0, 100000, 1)
+        if ok:
+            self.job.bandwidth.set_rate(limit_mb * 1024 * 1024)
+            self.update_from_job()
+
+    def change_priority(self, combo_index):
+        FileJobManager.instance().set_priority(self.job, self.priority_combo.itemData(combo_index))
+
+    def toggle_pause(self):
+        if self.job.state == FileJob.STATE_PAUSED: self.job.resume()
+        else: self.job.pause()
+
+    def retry_job(self):
+        retry_job = self.job.make_retry_job()
+        self.retried = True
+        self.retry_button.setEnabled(False)
+        if retry_job is None: return
+        retry_job.on_commit = self.job.on_commit
+        FileJobManager.instance().submit(retry_job)
+
+    def update_from_job(self):
+        job = self.job
+        title = f"[{job.state}] {job.title}"
+        if job.bandwidth.rate and not job.is_finished():
+            title += f" (최대 {format_bytes(job.bandwidth.rate)}/s)"
+        self.title_label.setText(title)
+        self.progress_bar.setValue(int(job.progress_fraction() * 1000))
+        detail = job.progress_text()
+        if job.errors:
+            detail += f"\n오류 {len(job.errors)}건: {job.errors[-1]}"
+        elif job.current_item and not job.is_finished():
+            detail += f"\n{job.current_item}"
+        elif job.state == FileJob.STATE_QUEUED:
+            detail = "같은 드라이브를 쓰는 앞선 작업이 끝나면 시작합니다."
+        self.detail_label.setText(detail)
+        routes = getattr(job, 'item_routes', None)
+        if routes:
+            lines = [f"{name}: {route}" for name, route in routes[:50]]
+            if len(routes) > 50: lines.append(f"... 외 {len(routes) - 50}개")
+            self.setToolTip("\n".join(lines))
+        self.pause_button.setText("재개" if job.state == FileJob.STATE_PAUSED else "일시정지")
+        self.pause_button.setEnabled(job.state in (FileJob.STATE_RUNNING, FileJob.STATE_PAUSED))
+        self.cancel_button.setEnabled(not job.is_finished())
+        can_retry = job.state in (FileJob.STATE_CANCELLED, FileJob.STATE_FAILED) or (job.is_finished() and bool(job.errors))
+        self.retry_button.setVisible(can_retry and type(job).make_retry_job is not FileJob.make_retry_job)
+        self.retry_button.setEnabled(not self.retried)
+        self.queue_controls.setVisible(job.state == FileJob.STATE_QUEUED)
+        self.limit_button.setEnabled(not job.is_finished())
+        self.priority_combo.setCurrentIndex(self.priority_combo.findData(job.priority))
+
+
+class FileJobsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("파일 작업 목록")
+        self.setModal(False)
+        self.resize(560, 360)
+        layout = QVBoxLayout(self)
+
+        self.rows_container = QWidget()
+        self.rows_layout = QVBoxLayout(self.rows_container)
+        self.rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.rows_layout.addStretch(1)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.rows_container)
+        layout.addWidget(scroll_area)
+
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addWidget(QLabel("전체 속도 제한:"))
+        self.global_limit_spin = QDoubleSpinBox()
+        self.global_limit_spin.setRange(0, 100000)
+        self.global_limit_spin.setDecimals(1)
+        self.global_limit_spin.setSuffix(" MB/s")
+        self.global_limit_spin.setSpecialValueText("제한 없음")
+        self.global_limit_spin.setKeyboardTracking(False)
+        self.global_limit_spin.setToolTip("모든 복사/이동 작업을 합친 최대 속도입니다. 실행 중인 작업에도 바로 적용됩니다.")
+        self.global_limit_spin.setValue(FileJobManager.instance().bandwidth.rate / (1024 * 1024))
+        self.global_limit_spin.valueChanged.connect(
+            lambda value: FileJobManager.instance().set_global_bandwidth(value * 1024 * 1024))
+        bottom_layout.addWidget(self.global_limit_spin)
+        bottom_layout.addStretch(1)
+        clear_button = QPushButton("완료된 작업 지우기")
+        clear_button.clicked.connect(self.clear_finished_jobs)
+        bottom_layout.addWidget(clear_button)
+        layout.addLayout(bottom_layout)
+
+        self.row_widgets = {}
+        manager = FileJobManager.instance()
+        manager.job_added.connect(self.add_job_row)
+        manager.job_changed.connect(self.update_job_row)
+        manager.job_finished.connect(self.update_job_row)
+        manager.queue_changed.connect(self.reorder_rows)
+        for job in manager.jobs:
+            self.add_job_row(job)
+        self.reorder_rows()
+
+    def add_job_row(self, job):
+        row_widget = FileJobRowWidget(job)
+        self.row_widgets[job.id] = row_widget
+        self.rows_layout.insertWidget(self.rows_layout.count() - 1, row_widget)
+
+    def update_job_row(self, job):
+        row_widget = self.row_widgets.get(job.id)
+        if row_widget: row_widget.update_from_job()
+
+    def reorder_rows(self):
+        # 실행 중/끝난 작업 다음에 대기 중인 작업을 실제 시작 순서대로 표시
+        manager = FileJobManager.instance()
+        queued = manager.queued_jobs()
+        ordered = [job for job in manager.jobs if job not in queued] + queued
+        position = 0
+        for job in ordered:
+            row_widget = self.row_widgets.get(job.id)
+            if row_widget is None: continue
+            if self.rows_layout.indexOf(row_widget) != position:
+                self.rows_layout.removeWidget(row_widget)
+                self.rows_layout.insertWidget(position, row_widget)
+            row_widget.update_from_job()
+            position += 1
+
+    def clear_finished_jobs(self):
+        FileJobManager.instance().clear_finished()
+        for job_id, row_widget in list(self.row_widgets.items()):
+            if row_widget.job.is_finished():
+                row_widget.setParent(None)
+                row_widget.deleteLater()
+                del self.row_widgets[job_id]
+# --- 백그라운드 파일 작업 끝 ---
+
+# --- [새로운 클래스] 실행 취소 백업 보관소 (용량 한도/보관 기간에 따른 자동 정리) ---
+class BackupStore(QObject):
+    usage_changed = pyqtSignal(object, object)   # (사용 중인 바이트, 한도 바이트)
+    backups_evicted = pyqtSignal(object)         # 정리된 백업 경로 집합 -> 작업 저널이 해당 실행 취소 기록을 지움
+
+    INDEX_FILENAME = "undo_backups.json"
+    QUOTA_SETTING = "backup_quota_mb"
+    MAX_AGE_SETTING = "backup_max_age_days"
+    DEFAULT_QUOTA_MB = 10 * 1024
+    DEFAULT_MAX_AGE_DAYS = 7
+    EVICTION_INTERVAL_MS = 10 * 60 * 1000
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = BackupStore()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._entries = {}   # 백업 경로 -> {'path', 'trash_info', 'created', 'size'}
+        self._eviction_thread = None
+        self._eviction_requested = False
+        self.used_bytes = 0
+        self._load_index()
+        self.eviction_timer = QTimer(self)
+        self.eviction_timer.timeout.connect(self.schedule_eviction)
+        self.eviction_timer.start(self.EVICTION_INTERVAL_MS)
+        self.schedule_eviction()
+
+    def quota_bytes(self):
+        return int(AppSettings.get(self.QUOTA_SETTING, self.DEFAULT_QUOTA_MB)) * 1024 * 1024
+
+    def max_age_days(self):
+        return int(AppSettings.get(self.MAX_AGE_SETTING, self.DEFAULT_MAX_AGE_DAYS))
+
+    def configure(self, quota_mb, max_age_days):
+        AppSettings.set(self.QUOTA_SETTING, int(quota_mb))
+        AppSettings.set(self.MAX_AGE_SETTING, int(max_age_days))
+        self.schedule_eviction()
+
+    def backup_count(self):
+        with self._lock:
+            return len(self._entries)
+
+    # --- 백업 등록/해제 (작업 스레드에서도 호출) ---
+    def register(self, action):
+        with self._lock:
+            self._entries[action['backup']] = {
+                'path': action['path'], 'trash_info': action.get('trash_info'),
+                'created': time.time(), 'size': None,
+            }
+        self.schedule_eviction()
+
+    def forget(self, backup_path):
+        with self._lock:
+            entry = self._entries.pop(backup_path, None)
+            if entry is None: return
+            self.used_bytes -= entry['size'] or 0
+        self._save_index()
+        self.usage_changed.emit(self.used_bytes, self.quota_bytes())
+
+    # --- 정리 ---
+    def schedule_eviction(self):
+        # 정리 스레드는 하나만. 실행 중에 다시 요청되면 끝난 뒤 한 번 더 돈다
+        with self._lock:
+            if self._eviction_thread is not None:
+                self._eviction_requested = True
+                return
+            self._eviction_thread = threading.Thread(target=self._eviction_loop, daemon=True)
+            self._eviction_thread.start()
+
+    def _eviction_loop(self):
+        while True:
+            try:
+                self._eviction_pass()
+            except Exception as e:
+                print(f"백업 정리 오류: {e}")
+            with self._lock:
+                if not self._eviction_requested:
+                    self._eviction_thread = None
+                    return
+                self._eviction_requested = False
+
+    def _eviction_pass(self):
+        self._adopt_untracked_backups()
+        with self._lock:
+            snapshot = {backup: dict(entry) for backup, entry in self._entries.items()}
+
+        # 이미 복원되었거나 밖에서 지워진 백업은 목록에서만 제거, 크기를 모르는 백업은 여기서 계산
+        missing = {backup for backup in snapshot if not os.path.lexists(backup)}
+        for backup, entry in snapshot.items():
+            if backup not in missing and entry['size'] is None:
+                entry['size'] = self._measure(backup)
+
+        now = time.time()
+        max_age_seconds = self.max_age_days() * 24 * 3600
+        quota = self.quota_bytes()
+        alive = sorted((entry['created'], backup) for backup, entry in snapshot.items() if backup not in missing)
+        victims = [backup for created, backup in alive if now - created > max_age_seconds]
+        total = sum(snapshot[backup]['size'] for created, backup in alive if backup not in victims)
+        for created, backup in alive:   # 오래된 것부터 한도 아래로 내려갈 때까지
+            if total <= quota: break
+            if backup in victims: continue
+            victims.append(backup)
+            total -= snapshot[backup]['size']
+
+        evicted = set()
+        for backup in victims:
+            try:
+                FileJob.remove_item(backup)
+                trash_info = snapshot[backup].get('trash_info')
+                if trash_info and os.path.exists(trash_info):
+                    os.remove(trash_info)
+                evicted.add(backup)
+            except OSError as e:
+                print(f"백업 정리 실패 ({backup}): {e}")
+
+        with self._lock:
+            for backup in missing | evicted:
+                self._entries.pop(backup, None)
+            for backup, entry in self._entries.items():
+                if entry['size'] is None and backup in snapshot:
+                    entry['size'] = snapshot[backup]['size']
+            self.used_bytes = sum(entry['size'] or 0 for entry in self._entries.values())
+        self._save_index()
+        if evicted:
+            self.backups_evicted.emit(evicted)
+        self.usage_changed.emit(self.used_bytes, quota)
+
+    def _adopt_untracked_backups(self):
+        # 이전 버전/비정상 종료로 목록에 없는 복사 백업도 한도 계산에 포함
+        fallback_dir = TrashStore.fallback_dir()
+        try:
+            with os.scandir(fallback_dir) as it:
+                entries = list(it)
+        except OSError:
+            return
+        with self._lock:
+            for entry in entries:
+                if entry.path in self._entries: continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                self._entries[entry.path] = {
+                    'path': None, 'trash_info': None,
+                    'created': max(st.st_mtime, st.st_ctime), 'size': None,
+                }
+
+    @staticmethod
+    def _measure(path):
+        total = 0
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            try:
+                st = os.lstat(current)
+            except OSError:
+                continue
+            total += st.st_size
+            if os.path.isdir(current) and not os.path.islink(current):
+                try:
+                    with os.scandir(current) as it:
+                        pending.extend(entry.path for entry in it)
+                except OSError:
+                    pass
+        return total
+
+    # --- 목록 저장 ---
+    def _load_index(self):
+        try:
+            with open(get_app_config_path(self.INDEX_FILENAME), 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+        except (OSError, ValueError):
+            return
+        for item in loaded if isinstance(loaded, list) else []:
+            if isinstance(item, dict) and item.get('backup'):
+                self._entries[item['backup']] = {
+                    'path': item.get('path'), 'trash_info': item.get('trash_info'),
+                    'created': item.get('created', time.time()), 'size': item.get('size'),
+                }
+
+    def _save_index(self):
+        with self._lock:
+            data = [dict(entry, backup=backup) for backup, entry in self._entries.items()]
+        try:
+            with open(get_app_config_path(self.INDEX_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+        except OSError as e:
+            print(f"백업 목록 저장 오류: {e}")
+
+
+class BackupSettingsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("실행 취소 백업 설정")
+        store = BackupStore.instance()
+        layout = QVBoxLayout(self)
+
+        self.usage_label = QLabel()
+        layout.addWidget(self.usage_label)
+
+        form_layout = QGridLayout()
+        form_layout.addWidget(QLabel("최대 용량 (GB):"), 0, 0)
+        self.quota_spin = QDoubleSpinBox()
+        self.quota_spin.setRange(0.1, 4096)
+        self.quota_spin.setDecimals(1)
+        self.quota_spin.setValue(store.quota_bytes() / (1024 ** 3))
+        form_layout.addWidget(self.quota_spin, 0, 1)
+        form_layout.addWidget(QLabel("최대 보관 기간 (일):"), 1, 0)
+        self.age_spin = QSpinBox()
+        self.age_spin.setRange(1, 365)
+        self.age_spin.setValue(store.max_age_days())
+        form_layout.addWidget(self.age_spin, 1, 1)
+        layout.addLayout(form_layout)
+
+        note_label = QLabel("한도를 넘거나 기간이 지난 백업은 오래된 것부터 자동으로 삭제되며,\n해당 삭제 작업은 더 이상 실행 취소할 수 없습니다.")
+        note_label.setStyleSheet("color: gray;")
+        layout.addWidget(note_label)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        store.usage_changed.connect(self.update_usage)
+        self.update_usage(store.used_bytes, store.quota_bytes())
+
+    def update_usage(self, used_bytes, quota_bytes):
+        self.usage_label.setText(f"현재 사용량: {format_bytes(used_bytes)} / {format_bytes(quota_bytes)} (백업 {BackupStore.instance().backup_count()}개)")
+
+    def accept(self):
+        BackupStore.instance().configure(round(self.quota_spin.value() * 1024), self.age_spin.value())
+        super().accept()
+# --- 실행 취소 백업 보관소 끝 ---
+
+# --- [새로운 클래스] 공유 작업 저널 (모든 패널 공통 실행 취소/다시 실행, 비정상 종료 복구) ---
+class OperationJournal(QObject):
+    # 추가 전용 JSON Lines 파일. 한 줄이 레코드 하나이고, 메모리 상태는 레코드를 순서대로 적용한 결과
+    #   begin/do/end/abort : 파일 작업 하나의 시작, 끝난 항목, 확정(트랜잭션 하나로 묶음), 되돌림
+    #                        (end 가 없으면 다음 실행 때 복구 대상)
+    #   do (g 없음)        : 항목 하나짜리 트랜잭션 (이름 바꾸기, 새 폴더 등)
+    #   partial            : 복사 중인 대상 경로 추가/해제 (중단되면 복구 시 삭제)
+    #   undo/redo          : 트랜잭션 실행 취소/다시 실행 (끝난 부분과 남은 부분)
+    #   drop/evict         : 트랜잭션 제거, 정리된 백업을 가진 항목 제거
+    #   snapshot           : 용량 한도를 넘어 압축할 때 쓰는 전체 상태
+    # 트랜잭션은 {'title', 'count', 'groups'} 이고, groups 는 같은 종류/같은 폴더의 연속 항목을
+    # {'type', 'dirs': {필드: 폴더}, 'names': [이름 또는 [필드별 이름]]} 하나로 묶은 것
+    history_changed = pyqtSignal()
+
+    JOURNAL_FILENAME = "operations.journal"
+    BUDGET_SETTING = "undo_journal_budget_mb"
+    DEFAULT_BUDGET_MB = 16
+    PATH_FIELDS = ('src', 'dst', 'path', 'backup', 'trash_info', 'old', 'new')
+    ACTION_LABELS = {'copy': "복사", 'move': "이동", 'delete': "삭제", 'rename': "이름 바꾸기", 'mkdir': "새 폴더"}
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = OperationJournal()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.RLock()
+        self.journal_path = get_app_config_path(self.JOURNAL_FILENAME)
+        self.undo_entries = []     # [(트랜잭션 번호, 트랜잭션)] 오래된 것부터
+        self.redo_entries = []     # [(트랜잭션 번호, 트랜잭션)] 마지막에 되돌린 것이 끝
+        self.pending_groups = {}   # 작업 번호 -> {'title', 'actions', 'partial'}
+        self.history_job = None    # 진행 중인 실행 취소/다시 실행 작업 (한 번에 하나)
+        self._last_entry_id = 0
+        self._last_group_id = 0
+        self._replay()
+        self.interrupted_group_ids = list(self.pending_groups)
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n")   # 잘린 마지막 줄 뒤에 이어 쓰지 않도록
+        if self._file.tell() > self.budget_bytes():
+            self._compact()
+        BackupStore.instance().backups_evicted.connect(self.drop_evicted_backups)
+
+    def budget_bytes(self):
+        return int(AppSettings.get(self.BUDGET_SETTING, self.DEFAULT_BUDGET_MB)) * 1024 * 1024
+
+    def _ends_with_newline(self):
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    # --- 트랜잭션 압축 표현 ---
+    @classmethod
+    def pack_actions(cls, actions):
+        # 연속된 같은 종류/같은 폴더 항목은 폴더를 한 번만 적고 이름만 나열 (항목 순서 유지)
+        groups = []
+        last_key = None
+        for action in actions:
+            fields = [field for field in cls.PATH_FIELDS if action.get(field)]
+            dirs = [os.path.dirname(action[field]) for field in fields]
+            key = (action['type'], tuple(fields), tuple(dirs))
+            if key != last_key:
+                groups.append({'type': action['type'], 'dirs': dict(zip(fields, dirs)), 'names': []})
+                last_key = key
+            names = [os.path.basename(action[field]) for field in fields]
+            groups[-1]['names'].append(names[0] if len(names) == 1 else names)
+        return groups
+
+    @staticmethod
+    def unpack_actions(groups):
+        for group in groups:
+            fields = list(group['dirs'])
+            for names in group['names']:
+                if isinstance(names, str): names = [names]
+                action = {'type': group['type']}
+                for field, name in zip(fields, names):
+                    action[field] = os.path.join(group['dirs'][field], name)
+                yield action
+
+    @classmethod
+    def make_transaction(cls, title, actions):
+        actions = list(actions)
+        if not title and actions:
+            title = cls.ACTION_LABELS.get(actions[0]['type'], actions[0]['type'])
+        return {'title': title, 'count': len(actions), 'groups': cls.pack_actions(actions)}
+
+    # --- 레코드 적용 (시작 시 재생과 실행 중 기록이 같은 경로를 사용) ---
+    def _replay(self):
+        try:
+            f = open(self.journal_path, 'r', encoding='utf-8')
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue   # 비정상 종료로 잘린 마지막 줄
+                if isinstance(record, dict):
+                    self._apply_record(record)
+
+    @staticmethod
+    def _take_entry(entries, entry_id):
+        for i in range(len(entries) - 1, -1, -1):
+            if entries[i][0] == entry_id:
+                return entries.pop(i)
+        return None
+
+    def _push_undo_entry(self, entry_id, transaction):
+        if transaction['count']:
+            self.undo_entries.append((entry_id, transaction))
+            self.redo_entries.clear()
+
+    def _apply_record(self, record):
+        kind = record.get('r')
+        if kind == 'snapshot':
+            self.undo_entries = [tuple(entry) for entry in record.get('undo', [])]
+            self.redo_entries = [tuple(entry) for entry in record.get('redo', [])]
+            self.pending_groups = {int(group_id): group for group_id, group in record.get('pending', {}).items()}
+            self._last_entry_id = max(self._last_entry_id, record.get('last_e', 0))
+            self._last_group_id = max(self._last_group_id, record.get('last_g', 0))
+        elif kind == 'begin':
+            self.pending_groups[record['g']] = {'title': record.get('title', ''), 'actions': [], 'partials': []}
+        elif kind == 'do':
+            group = self.pending_groups.get(record.get('g'))
+            if group is not None:
+                group['actions'].append(record['a'])
+            else:
+                self._push_undo_entry(record['e'], self.make_transaction(record.get('title'), [record['a']]))
+        elif kind == 'partial':
+            group = self.pending_groups.get(record['g'])
+            if group is not None:
+                if record.get('done'):
+                    if record['p'] in group['partials']: group['partials'].remove(record['p'])
+                else:
+                    group['partials'].append(record['p'])
+        elif kind == 'end':
+            group = self.pending_groups.pop(record['g'], None)
+            if group:
+                self._push_undo_entry(record['e'], self.make_transaction(group['title'], group['actions']))
+        elif kind == 'abort':
+            self.pending_groups.pop(record['g'], None)
+        elif kind in ('undo', 'redo'):
+            source, target = (self.undo_entries, self.redo_entries) if kind == 'undo' else (self.redo_entries, self.undo_entries)
+            entry = self._take_entry(source, record['e'])
+            if entry:
+                # 끝난 부분은 반대쪽으로, 취소/실패로 남은 부분은 제자리에
+                if record['left']['count']: source.append((entry[0], record['left']))
+                if record['done']['count']: target.append((entry[0], record['done']))
+        elif kind == 'drop':
+            dropped = set(record.get('e', []))
+            self.undo_entries = [entry for entry in self.undo_entries if entry[0] not in dropped]
+            self.redo_entries = [entry for entry in self.redo_entries if entry[0] not in dropped]
+        elif kind == 'evict':
+            evicted = set(record.get('b', []))
+            def keep(action): return not (action['type'] == 'delete' and action['backup'] in evicted)
+            for entries in (self.undo_entries, self.redo_entries):
+                for i, (entry_id, transaction) in enumerate(entries):
+                    actions = list(self.unpack_actions(transaction['groups']))
+                    if not all(keep(action) for action in actions):
+                        entries[i] = (entry_id, self.make_transaction(transaction['title'], filter(keep, actions)))
+                entries[:] = [entry for entry in entries if entry[1]['count']]
+            for group in self.pending_groups.values():
+                group['actions'] = [action for action in group['actions'] if keep(action)]
+        if isinstance(record.get('e'), int): self._last_entry_id = max(self._last_entry_id, record['e'])
+        if isinstance(record.get('g'), int): self._last_group_id = max(self._last_group_id, record['g'])
+
+    def _append(self, record, sync=False):
+        with self._lock:
+            self._apply_record(record)
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # flush 만으로도 프로그램이 죽었을 때는 남음. 작업 경계(확정/실행 취소)는 디스크까지 기록
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+            if self._file.tell() > self.budget_bytes():
+                self._compact()
+        if record['r'] not in ('begin', 'partial') and not (record['r'] == 'do' and 'g' in record):
+            self.history_changed.emit()
+
+    def _compact(self):
+        # 현재 상태를 snapshot 한 줄로 다시 쓰고, 한도의 절반을 넘으면 가장 오래된 트랜잭션부터 버림
+        budget = self.budget_bytes()
+        while True:
+            snapshot = {
+                'r': 'snapshot', 'last_e': self._last_entry_id, 'last_g': self._last_group_id,
+                'undo': self.undo_entries, 'redo': self.redo_entries,
+                'pending': {str(group_id): group for group_id, group in self.pending_groups.items()},
+            }
+            text = json.dumps(snapshot, ensure_ascii=False) + "\n"
+            if len(text.encode('utf-8')) <= budget // 2 or not (self.undo_entries or self.redo_entries):
+                break
+            if self.undo_entries:
+                del self.undo_entries[:max(1, len(self.undo_entries) // 10)]
+            else:
+                del self.redo_entries[:max(1, len(self.redo_entries) // 10)]
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(temp_path, self.journal_path)
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _next_entry_id(self):
+        self._last_entry_id += 1
+        return self._last_entry_id
+
+    # --- 기록 (작업 스레드에서도 호출) ---
+    def begin_group(self, title):
+        with self._lock:
+            self._last_group_id += 1
+            group_id = self._last_group_id
+            self._append({'r': 'begin', 'g': group_id, 'title': title})
+        return group_id
+
+    def record(self, action, group_id=None):
+        with self._lock:
+            if group_id is not None:
+                self._append({'r': 'do', 'g': group_id, 'a': action})
+            else:
+                self._append({'r': 'do', 'e': self._next_entry_id(), 'a': action}, sync=True)
+
+    def mark_partial(self, group_id, path, done=False):
+        record = {'r': 'partial', 'g': group_id, 'p': path}
+        if done: record['done'] = True
+        self._append(record)
+
+    def end_group(self, group_id):
+        with self._lock:
+            self._append({'r': 'end', 'g': group_id, 'e': self._next_entry_id()}, sync=True)
+
+    # --- 실행 취소/다시 실행 ---
+    def peek_undo(self):
+        with self._lock:
+            return self.undo_entries[-1] if self.undo_entries else None
+
+    def peek_redo(self):
+        with self._lock:
+            return self.redo_entries[-1] if self.redo_entries else None
+
+    def finish_history_job(self, job):
+        # 작업 스레드에서 호출. 끝난 부분만 반대쪽 목록으로 옮기고 남은 부분은 그대로 둠
+        title = job.transaction['title']
+        self._append({'r': 'redo' if job.redo else 'undo', 'e': job.entry_id,
+                      'done': self.make_transaction(title, job.completed_actions),
+                      'left': self.make_transaction(title, job.remaining_actions)}, sync=True)
+        with self._lock:
+            if self.history_job is job: self.history_job = None
+
+    def drop(self, entry_ids):
+        if entry_ids:
+            self._append({'r': 'drop', 'e': list(entry_ids)}, sync=True)
+
+    def drop_evicted_backups(self, evicted_backups):
+        # 백업이 정리된 삭제 항목은 더 이상 되돌릴 수 없으므로 기록에서 제거
+        self._append({'r': 'evict', 'b': sorted(evicted_backups)}, sync=True)
+
+    # --- 비정상 종료 복구 ---
+    def interrupted_groups(self):
+        with self._lock:
+            return [(group_id, self.pending_groups[group_id]) for group_id in self.interrupted_group_ids
+                    if group_id in self.pending_groups]
+
+    def _remove_partials(self, group):
+        errors = []
+        for path in group.get('partials', []):
+            try:
+                FileJob.remove_item(path)
+            except OSError as e:
+                errors.append(f"{path}: {e}")
+        return errors
+
+    def keep_group(self, group_id, remove_partials=True):
+        # 끝난 항목만 실행 취소 기록에 남기고, 복사 도중이던 대상은 지움 (원본은 그대로 있음)
+        # 이어서 복사할 때는 도중이던 대상을 남겨 두고 다시 시도하는 작업이 그 위에 이어 씀
+        group = self.pending_groups.get(group_id)
+        if group is None: return
+        if remove_partials:
+            self._remove_partials(group)
+        if group['actions']:
+            self.end_group(group_id)
+        else:
+            self._append({'r': 'abort', 'g': group_id}, sync=True)
+
+    def rollback_group(self, group_id):
+        group = self.pending_groups.get(group_id)
+        if group is None: return []
+        errors = self._remove_partials(group)
+        for action in reversed(group['actions']):
+            try:
+                self.revert_action(action)
+            except Exception as e:
+                errors.append(f"{self.action_target(action)}: {e}")
+        self._append({'r': 'abort', 'g': group_id}, sync=True)
+        return errors
+
+    # --- 항목 하나 되돌리기/다시 적용 ---
+    @staticmethod
+    def action_target(action):
+        return action.get('path') or action.get('dst') or action.get('new')
+
+    @staticmethod
+    def revert_action(action):
+        if action['type'] == 'copy':
+            FileJob.remove_item(action['path'])
+        elif action['type'] == 'move':
+            shutil.move(action['dst'], action['src'])
+        elif action['type'] == 'delete':
+            if not os.path.lexists(action['backup']):
+                raise FileNotFoundError(errno.ENOENT, "백업 파일이 존재하지 않아 복원할 수 없습니다", action['backup'])
+            TrashStore.restore(action)
+            BackupStore.instance().forget(action['backup'])
+        elif action['type'] == 'rename':
+            os.rename(action['new'], action['old'])
+        elif action['type'] == 'mkdir':
+            shutil.rmtree(action['path'])
+
+    @staticmethod
+    def reapply_action(action):
+        # 다시 실행. 삭제는 새 백업 위치가 생기므로 바뀐 action 을 돌려줌
+        target = {'copy': 'path', 'move': 'dst', 'rename': 'new', 'mkdir': 'path'}.get(action['type'])
+        if target and os.path.lexists(action[target]):
+            raise FileExistsError(errno.EEXIST, "같은 이름의 항목이 이미 있습니다", action[target])
+        if action['type'] == 'copy':
+            if not action.get('src'):
+                raise FileNotFoundError(errno.ENOENT, "원본 경로가 기록되지 않아 다시 복사할 수 없습니다", action['path'])
+            if os.path.isdir(action['src']):
+                shutil.copytree(action['src'], action['path'], symlinks=True)
+            else:
+                shutil.copy2(action['src'], action['path'])
+        elif action['type'] == 'move':
+            shutil.move(action['src'], action['dst'])
+        elif action['type'] == 'delete':
+            try:
+                action = TrashStore.move_to_trash(action['path'])
+            except OSError as e:
+                if e.errno != errno.EXDEV: raise
+                temp_dir = TrashStore.fallback_dir()
+                os.makedirs(temp_dir, exist_ok=True)
+                backup_path = os.path.join(temp_dir, os.path.basename(action['path']) + "_" + str(uuid.uuid4().hex[:8]))
+                if os.path.isdir(action['path']) and not os.path.islink(action['path']):
+                    shutil.copytree(action['path'], backup_path, symlinks=True)
+                else:
+                    shutil.copy2(action['path'], backup_path, follow_symlinks=False)
+                FileJob.remove_item(action['path'])
+                action = {'type': 'delete', 'path': action['path'], 'backup': backup_path}
+            BackupStore.instance().register(action)
+        elif action['type'] == 'rename':
+            os.rename(action['old'], action['new'])
+        elif action['type'] == 'mkdir':
+            os.makedirs(action['path'])
+        return action
+
+
+class HistoryJob(FileJob):
+    # 트랜잭션 하나를 백그라운드 작업 한 번으로 실행 취소(또는 다시 실행)
+    journaled = False
+
+    def __init__(self, entry_id, transaction, redo=False):
+        super().__init__(f"{'다시 실행' if redo else '실행 취소'}: {transaction['title']}")
+        self.entry_id = entry_id
+        self.transaction = transaction
+        self.redo = redo
+        self.completed_actions = []   # 원래 순서. 다시 실행은 새 백업 위치가 반영된 action
+        self.remaining_actions = []
+
+    def io_paths(self):
+        return [action[field] for action in OperationJournal.unpack_actions(self.transaction['groups'])
+                for field in ('src', 'dst', 'path', 'backup') if action.get(field)]
+
+    def run(self):
+        actions = list(OperationJournal.unpack_actions(self.transaction['groups']))
+        if not self.redo:
+            actions.reverse()
+        self.files_total = len(actions)
+        done_count = 0
+        try:
+            for action in actions:
+                self.checkpoint()
+                self.current_item = OperationJournal.action_target(action)
+                try:
+                    if self.redo:
+                        self.completed_actions.append(OperationJournal.reapply_action(action))
+                    else:
+                        OperationJournal.revert_action(action)
+                        self.completed_actions.append(action)
+                except Exception as e:
+                    # 실패한 항목은 기록에서 빠짐 (기존 실행 취소와 같은 동작)
+                    self.add_error(os.path.basename(self.current_item or ""), e)
+                done_count += 1
+                self.add_progress(files_count=1)
+        finally:
+            self.remaining_actions = actions[done_count:]
+            if not self.redo:
+                self.completed_actions.reverse()
+                self.remaining_actions.reverse()
+            OperationJournal.instance().finish_history_job(self)
+# --- 공유 작업 저널 끝 ---
+
+# --- [새로운 클래스] 패널 지연 구성 대기열 (화면에 보이는 패널부터 한 번에 하나씩 모델 생성) ---
+class PanelMaterializationQueue(QObject):
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = PanelMaterializationQueue()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.waiting = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.materialize_next)
+
+    def request(self, panel):
+        if panel not in self.waiting: self.waiting.append(panel)
+        if not self.timer.isActive(): self.timer.start()
+
+    def discard(self, panel):
+        if panel in self.waiting: self.waiting.remove(panel)
+
+    def materialize_next(self):
+        # 이벤트 루프 한 바퀴에 패널 하나: 창은 바로 그려지고, 실제로 보이는 영역이 있는 패널이 먼저 구성됨
+        still_waiting = []
+        for panel in self.waiting:
+            try:
+                if not panel.is_materialized() and panel.isVisible(): still_waiting.append(panel)
+            except RuntimeError:
+                pass   # 이미 삭제된 패널
+        self.waiting = still_waiting
+        if not self.waiting:
+            self.timer.stop()
+            return
+        panel = next((p for p in self.waiting if not p.visibleRegion().isEmpty()), self.waiting[0])
+        self.waiting.remove(panel)
+        panel.materialize()
+# --- 패널 지연 구성 대기열 끝 ---
+
+# --- [새로운 클래스] 유휴 패널 휴면 (오래 안 쓴 대용량 폴더 모드 패널의 모델/폴더 감시 해제) ---
+class PanelHibernationPolicy(QObject):
+    _instance = None
+    IDLE_SETTING = "panel_hibernate_idle_minutes"
+    DEFAULT_IDLE_MINUTES = 30          # 0 이면 시간 기준 휴면 끔
+    MEMORY_PRESSURE_PERCENT = 90       # 시스템 메모리 사용률이 이 이상이면 잠깐 쉰 패널도 휴면
+    PRESSURE_MIN_IDLE_SECONDS = 60
+    CHECK_INTERVAL_MS = 60 * 1000
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = PanelHibernationPolicy()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.panels = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self.check)
+
+    def register(self, panel):
+        if panel not in self.panels: self.panels.append(panel)
+        if not self.timer.isActive(): self.timer.start()
+
+    def unregister(self, panel):
+        if panel in self.panels: self.panels.remove(panel)
+
+    def idle_seconds(self):
+        return int(AppSettings.get(self.IDLE_SETTING, self.DEFAULT_IDLE_MINUTES)) * 60
+
+    def set_idle_minutes(self, minutes):
+        AppSettings.set(self.IDLE_SETTING, int(minutes))
+
+    @staticmethod
+    def system_memory_load():
+        # 시스템 메모리 사용률(%) - 알 수 없으면 None
+        if os.name == 'nt':
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.dwMemoryLoad
+            return None
+        try:
+            meminfo = {}
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    meminfo[key] = int(value.split()[0])
+            return 100 - 100 * meminfo['MemAvailable'] // meminfo['MemTotal']
+        except (OSError, KeyError, ValueError, ZeroDivisionError):
+            return None
+
+    def check(self):
+        idle_limit = self.idle_seconds()
+        memory_load = self.system_memory_load()
+        if memory_load is not None and memory_load >= self.MEMORY_PRESSURE_PERCENT:
+            idle_limit = min(idle_limit, self.PRESSURE_MIN_IDLE_SECONDS) if idle_limit > 0 else self.PRESSURE_MIN_IDLE_SECONDS
+        if idle_limit <= 0: return
+        now = time.monotonic()
+        for panel in list(self.panels):
+            try:
+                if panel.is_materialized() and now - panel.last_interaction >= idle_limit and panel.can_hibernate():
+                    panel.hibernate()
+            except RuntimeError:
+                self.panels.remove(panel)   # 이미 삭제된 패널
+# --- 유휴 패널 휴면 끝 ---
+
 class ExplorerPanel(QWidget):
     request_new_panel = pyqtSignal(str)
 
     copied_item = None
     cut_item = None
-    MAX_UNDO = 10
+    ENGINE_SHARED = 'shared'     # 공유 QFileSystemModel
+    ENGINE_SCANDIR = 'scandir'   # 대용량 폴더용 os.scandir 지연 로딩 모델
+    DEFAULT_MODEL_ENGINE = ENGINE_SHARED
 
-    def __init__(self, path=''):
+    def __init__(self, path='', engine=None, lazy=False):
+        # lazy=True 이면 경로만 가진 자리표시 패널로 시작하고, 처음 보이거나 포커스를 받을 때 모델을 만들고 폴더를 읽음
         super().__init__()
-        self.undo_stack = []
+        self.model_engine = engine if engine in (self.ENGINE_SHARED, self.ENGINE_SCANDIR) else self.DEFAULT_MODEL_ENGINE
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -128,9 +3706,7 @@ class ExplorerPanel(QWidget):
         top_controls_layout.addWidget(self.delete_button)
         main_layout.addLayout(top_controls_layout)
 
-        self.model = QFileSystemModel()
-        self.model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot | QDir.Hidden | QDir.System)
-        self.model.setRootPath('')
+        self.model = None
         self.tree = QTreeView()
         self.tree.setDragDropMode(QAbstractItemView.DragDrop)
         self.tree.setDefaultDropAction(Qt.MoveAction)
@@ -138,20 +3714,6 @@ class ExplorerPanel(QWidget):
         self.tree.setItemDelegate(hidden_file_delegate)
         self.tree.dragEnterEvent = self.custom_tree_dragEnterEvent
         self.tree.setEditTriggers(QTreeView.AllEditTriggers)
-        self.tree.setModel(self.model)
-
-        default_dir = QDir.homePath()
-        if not path or not os.path.isdir(path):
-            path = default_dir
-
-        root_idx = self.model.index(path)
-        if not root_idx.isValid() or not self.model.isDir(root_idx) :
-            root_idx = self.model.index(default_dir)
-        self.tree.setRootIndex(root_idx)
-
-        self.tree.setColumnWidth(0, 250)
-        self.tree.setSortingEnabled(True)
-        self.tree.sortByColumn(0, Qt.AscendingOrder)
         self.tree.doubleClicked.connect(self.on_double_click)
 
         self.tree.setDragEnabled(True)
@@ -173,23 +3735,191 @@ class ExplorerPanel(QWidget):
         self.previous_paths = []
         self.forward_paths = []
         self.pending_navigation_path = None
+        self.tree.installEventFilter(self)
+        self.tree.viewport().installEventFilter(self)
+        self.path_input.installEventFilter(self)
+
+        self.pending_root_path = path if path and os.path.isdir(path) else QDir.homePath()
+        self.hibernated = False         # 휴면 중: 다시 보여도 깨우지 않고 사용자 조작(eventFilter)에서만 복원
+        self.hibernated_view = None     # 휴면 중 보관한 선택/스크롤/정렬 상태
+        self.last_interaction = time.monotonic()
+        PanelHibernationPolicy.instance().register(self)
+        if lazy:
+            self.show_placeholder_location()
+        else:
+            self.materialize()
+
+    def is_materialized(self):
+        return self.model is not None
+
+    def show_placeholder_location(self):
+        placeholder_path = os.path.normpath(self.pending_root_path)
+        self.path_input.setText(placeholder_path)
+        self.folder_label.setText(os.path.basename(placeholder_path) or placeholder_path)
+
+    def materialize(self):
+        if self.model is not None: return
+        PanelMaterializationQueue.instance().discard(self)
+        self.hibernated = False
+        self.model = self.create_model()
+        self.tree.setModel(self.model)
+
+        default_dir = QDir.homePath()
+        path = self.pending_root_path
+        if not path or not os.path.isdir(path):
+            path = default_dir
+
+        root_idx = self.model.index(path)
+        if not root_idx.isValid() or not self.model.isDir(root_idx) :
+            root_idx = self.model.index(default_dir)
+        self.tree.setRootIndex(root_idx)
+
+        self.tree.setColumnWidth(0, 250)
+        self.tree.setSortingEnabled(True)
+        if self.hibernated_view:
+            self.tree.header().restoreState(self.hibernated_view["header"])
+            self.tree.sortByColumn(*self.hibernated_view["sort"])
+        else:
+            self.tree.sortByColumn(0, Qt.AscendingOrder)
         self.model.directoryLoaded.connect(self.on_directory_loaded)
         self.update_path_input(self.tree.rootIndex())
-        self.tree.installEventFilter(self)
+        if self.hibernated_view:
+            self.restore_hibernated_view()   # 이미 캐시에 있으면 바로, 아니면 폴더를 다 읽은 뒤 복원
+
+    def can_hibernate(self):
+        # 공유 엔진 패널은 휴면해도 패널별 정렬 프록시만 버려지고 공유 모델의 캐시/감시는 그대로라
+        # 아끼는 메모리 없이 다시 그리는 비용만 생김. 모델을 혼자 가진 대용량 폴더 모드 패널만 휴면
+        if self.model_engine != self.ENGINE_SCANDIR: return False
+        focus_widget = QApplication.focusWidget()
+        if focus_widget is not None and self.isAncestorOf(focus_widget): return False
+        if self.underMouse() or self.pending_navigation_path: return False
+        return self.tree.state() == QAbstractItemView.NoState   # 이름 바꾸기/끌어놓기 중에는 유지
+
+    def hibernate(self):
+        # 경로/선택/스크롤/정렬만 남기고 모델(과 그 캐시, 폴더 감시)을 버림. 다시 쓰면 materialize 로 복원
+        if self.model is None: return
+        header = self.tree.header()
+        root_idx = self.tree.rootIndex()
+        self.pending_root_path = self.model.filePath(root_idx) or self.pending_root_path
+        current_idx = self.tree.currentIndex()
+        self.hibernated_view = {
+            "selection": [self.model.filePath(idx) for idx in self.tree.selectionModel().selectedRows(0)],
+            "current": self.model.filePath(current_idx) if current_idx.isValid() else None,
+            "scroll": (self.tree.verticalScrollBar().value(), self.tree.horizontalScrollBar().value()),
+            "sort": (header.sortIndicatorSection(), header.sortIndicatorOrder()),
+            "header": header.saveState(),
+        }
+        old_model, old_selection_model = self.model, self.tree.selectionModel()
+        self.model = None
+        self.tree.setModel(None)
+        if isinstance(old_model, ScandirListModel):
+            old_model.release()
+        old_selection_model.deleteLater()
+        old_model.deleteLater()
+        self.hibernated = True
+        self.show_placeholder_location()
+
+    def restore_hibernated_view(self, final=False):
+        view = self.hibernated_view
+        if not view or self.model is None: return
+        selection_model = self.tree.selectionModel()
+        restored = 0
+        for path in view["selection"]:
+            idx = self.model.index(path)
+            if idx.isValid():
+                selection_model.select(idx, QItemSelectionModel.Select | QItemSelectionModel.Rows)
+                restored += 1
+        if view["current"]:
+            current_idx = self.model.index(view["current"])
+            if current_idx.isValid():
+                selection_model.setCurrentIndex(current_idx, QItemSelectionModel.NoUpdate)
+        vertical, horizontal = view["scroll"]
+        QTimer.singleShot(0, lambda: (self.tree.verticalScrollBar().setValue(vertical),
+                                      self.tree.horizontalScrollBar().setValue(horizontal)))
+        if final or (restored == len(view["selection"]) and self.model.rowCount(self.tree.rootIndex()) > 0):
+            self.hibernated_view = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 한 번도 구성되지 않은 패널만 (휴면 패널은 창을 최소화/복원해도 그대로 둠)
+        if self.model is None and not self.hibernated:
+            PanelMaterializationQueue.instance().request(self)
+
+    def create_model(self):
+        if self.model_engine == self.ENGINE_SCANDIR:
+            return ScandirListModel(self)
+        return SharedFileSystemService.create_panel_model(self)
+
+    def set_model_engine(self, engine):
+        if engine == self.model_engine: return
+        if self.model is None:
+            self.model_engine = engine
+            return
+        current_path = self.model.filePath(self.tree.rootIndex())
+        header = self.tree.header()
+        sort_column, sort_order = header.sortIndicatorSection(), header.sortIndicatorOrder()
+        old_model, old_selection_model = self.model, self.tree.selectionModel()
+
+        self.model_engine = engine
+        self.model = self.create_model()
+        self.model.directoryLoaded.connect(self.on_directory_loaded)
+        self.tree.setRootIndex(QModelIndex())
+        self.tree.setModel(self.model)
+        old_selection_model.deleteLater()
+        old_model.deleteLater()
+
+        root_idx = self.model.index(current_path)
+        if not root_idx.isValid():
+            root_idx = self.model.index(QDir.homePath())
+        self.tree.setRootIndex(root_idx)
+        self.tree.setColumnWidth(0, 250)
+        self.tree.sortByColumn(sort_column, sort_order)
+        self.update_path_input(root_idx)
+
+    def current_root_path(self):
+        if self.model is None:
+            return os.path.normpath(self.pending_root_path)
+        return os.path.normpath(self.model.filePath(self.tree.rootIndex()))
+
+    def reset_to_location(self, path, engine=None):
+        # 레이아웃 불러오기에서 기존 패널을 재사용할 때: 모델(과 그 캐시)은 그대로 두고 루트 인덱스만 다시 지정
+        if engine in (self.ENGINE_SHARED, self.ENGINE_SCANDIR) and engine != self.model_engine:
+            self.set_model_engine(engine)
+        self.previous_paths.clear()
+        self.forward_paths.clear()
+        self.pending_navigation_path = None
+        if not path or not os.path.isdir(path):
+            path = QDir.homePath()
+        if self.model is None:
+            self.pending_root_path = path
+            self.show_placeholder_location()
+            return
+        if self.current_root_path() == os.path.normpath(path):
+            return
+        root_idx = self.model.index(path)
+        if not root_idx.isValid():
+            root_idx = self.model.index(QDir.homePath())
+        self.tree.clearSelection()
+        self.tree.setRootIndex(root_idx)
+        self.tree.scrollToTop()
+        self.update_path_input(root_idx)
 
     def custom_tree_dragEnterEvent(self, event: QKeyEvent):
+        self.materialize()   # 포커스 없이 끌어다 놓는 자리표시 패널도 모델이 있어야 대상 폴더를 찾음
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
         else:
             QTreeView.dragEnterEvent(self.tree, event)
 
     def custom_tree_dragMoveEvent(self, event: QKeyEvent):
+        self.materialize()
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
         else:
             QTreeView.dragMoveEvent(self.tree, event)
 
     def custom_tree_dropEvent(self, event: QKeyEvent):
+        self.materialize()
         mime_data = event.mimeData()
         if not mime_data.hasUrls():
             event.ignore()
@@ -221,89 +3951,87 @@ class ExplorerPanel(QWidget):
             elif event.dropAction() == Qt.CopyAction :
                  is_copy_action = True
 
-        processed_at_least_one = False
+        sources = []
         for url in mime_data.urls():
             src_path = url.toLocalFile()
             if not src_path or not os.path.exists(src_path):
                 continue
-
-            base_name = os.path.basename(src_path)
-            if os.path.normpath(os.path.dirname(src_path)) == os.path.normpath(destination_folder_path) and \
-               base_name == self.get_non_conflicting_name(destination_folder_path, base_name) and \
-               not is_copy_action:
+            # 같은 폴더로 이동하는 항목은 할 일이 없음
+            if not is_copy_action and os.path.normpath(src_path) == os.path.normpath(os.path.join(destination_folder_path, os.path.basename(src_path))):
                 continue
+            sources.append(src_path)
 
-            dest_path_candidate = os.path.join(destination_folder_path, base_name)
-            if is_copy_action or (not is_copy_action and os.path.exists(dest_path_candidate) and os.path.normpath(src_path) != os.path.normpath(dest_path_candidate)):
-                dest_path = os.path.join(destination_folder_path, self.get_non_conflicting_name(destination_folder_path, base_name))
-            else:
-                dest_path = dest_path_candidate
-
-            try:
-                if is_copy_action:
-                    if os.path.isdir(src_path):
-                        shutil.copytree(src_path, dest_path)
-                    else:
-                        shutil.copy2(src_path, dest_path)
-                    self.push_undo({'type': 'copy', 'path': dest_path})
-                else:
-                    shutil.move(src_path, dest_path)
-                    self.push_undo({'type': 'move', 'src': src_path, 'dst': dest_path})
-                processed_at_least_one = True
-            except Exception as e:
-                QMessageBox.warning(self, "드롭 작업 오류", f"'{base_name}' 처리 중 오류: {e}")
-
-        if processed_at_least_one:
+        if sources:
+            self.submit_paste_job(sources, destination_folder_path, not is_copy_action, "드롭 작업 오류")
             event.acceptProposedAction()
-            self.refresh_current_view()
         else:
             event.ignore()
 
+    def submit_file_job(self, job, error_title, on_commit=None):
+        # 파일 작업은 작업 스레드에서 실행하고 (실행 취소 기록은 공유 작업 저널에), 끝난 뒤 GUI 스레드에서 오류 표시
+        job.on_commit = functools.partial(self.on_file_job_committed, error_title, on_commit)
+        FileJobManager.instance().submit(job)
+        main_window = self.window()
+        if hasattr(main_window, 'statusBar'):
+            if job.state == FileJob.STATE_QUEUED:
+                main_window.statusBar().showMessage(f"{job.title} 작업은 같은 드라이브의 앞선 작업이 끝나면 시작합니다.", 3000)
+            else:
+                main_window.statusBar().showMessage(f"{job.title} 작업을 시작했습니다.", 2000)
+        return job
+
+    def on_file_job_committed(self, error_title, on_commit, job):
+        if on_commit is not None:
+            on_commit(job)
+        if job.verify_failures:
+            QMessageBox.critical(self, "복사 검증 실패",
+                                 f"{len(job.verify_failures)}개 파일이 원본과 다르게 복사되었습니다. 해당 파일을 사용하지 마세요.\n\n"
+                                 + "\n".join(job.verify_failures[:20]) + "\n\n" + "\n".join(job.notes))
+        elif job.errors:
+            QMessageBox.warning(self, error_title, "\n".join(job.errors[:20]))
+        self.refresh_current_view()
+
     def push_undo(self, action):
-        self.undo_stack.append(action)
-        if len(self.undo_stack) > self.MAX_UNDO:
-            self.undo_stack.pop(0)
+        OperationJournal.instance().record(action)
 
     def undo(self):
-        if not self.undo_stack:
-            QMessageBox.information(self, "실행 취소", "되돌릴 작업이 없습니다.")
+        self.start_history_job(redo=False)
+
+    def redo(self):
+        self.start_history_job(redo=True)
+
+    def start_history_job(self, redo):
+        # 사용자 작업 하나(트랜잭션)를 백그라운드에서 한 번에 되돌리거나 다시 실행
+        journal = OperationJournal.instance()
+        label = "다시 실행" if redo else "실행 취소"
+        if journal.history_job is not None:
+            QMessageBox.information(self, label, "이전 실행 취소/다시 실행 작업이 아직 진행 중입니다.")
             return
-        action = self.undo_stack.pop()
-        try:
-            if action['type'] == 'copy':
-                if os.path.isdir(action['path']):
-                    shutil.rmtree(action['path'])
-                else:
-                    os.remove(action['path'])
-            elif action['type'] == 'move':
-                shutil.move(action['dst'], action['src'])
-            elif action['type'] == 'delete':
-                if os.path.exists(action['backup']):
-                    if os.path.isdir(action['backup']):
-                        shutil.move(action['backup'], action['path'])
-                    else:
-                        shutil.move(action['backup'], action['path'])
-                else:
-                    QMessageBox.warning(self, "실행 취소 오류", "백업 파일이 존재하지 않아 복원할 수 없습니다.")
-            elif action['type'] == 'rename':
-                os.rename(action['new'], action['old'])
-            elif action['type'] == 'mkdir':
-                shutil.rmtree(action['path'])
-            QMessageBox.information(self, "실행 취소", f"'{action['type']}' 작업이 취소되었습니다.")
-        except Exception as e:
-            QMessageBox.warning(self, "실행 취소 오류", f"실행 취소 실패: {e}")
-        self.refresh_current_view()
+        entry = journal.peek_redo() if redo else journal.peek_undo()
+        if entry is None:
+            QMessageBox.information(self, label, "다시 실행할 작업이 없습니다." if redo else "되돌릴 작업이 없습니다.")
+            return
+        journal.history_job = HistoryJob(entry[0], entry[1], redo)
+        self.submit_file_job(journal.history_job, f"{label} 오류", self.on_history_job_committed)
+
+    def on_history_job_committed(self, job):
+        if job.errors or job.state != FileJob.STATE_DONE:
+            return
+        label = "다시 실행" if job.redo else "실행 취소"
+        QMessageBox.information(self, label, f"'{job.transaction['title']}' ({len(job.completed_actions)}개 항목) 작업을 {label}했습니다.")
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.matches(QKeySequence.Undo): self.undo()
+        elif event.matches(QKeySequence.Redo): self.redo()
         elif event.matches(QKeySequence.Copy): self.copy_selected_items()
         elif event.matches(QKeySequence.Cut): self.cut_selected_items()
         elif event.matches(QKeySequence.Paste): self.paste_item()
+        elif event.key() == Qt.Key_Delete and event.modifiers() & Qt.ShiftModifier: self.delete_items(permanent=True)
         elif event.key() == Qt.Key_Delete: self.delete_items()
         else: super().keyPressEvent(event)
 
     # [수정] os.startfile을 subprocess.Popen으로 변경
     def on_double_click(self, index):
+        if self.model is None: return   # 자리표시 상태의 인덱스는 없음
         if self.model.isDir(index):
             path = self.model.filePath(index)
             self.deferred_navigate(path)
@@ -332,6 +4060,7 @@ class ExplorerPanel(QWidget):
                     QMessageBox.warning(self, "파일 실행 오류", f"파일 실행 중 오류 발생: {e}")
 
     def go_back(self):
+        self.materialize()
         if self.previous_paths:
             current_display_path = self.model.filePath(self.tree.rootIndex())
             self.forward_paths.append(current_display_path)
@@ -342,6 +4071,7 @@ class ExplorerPanel(QWidget):
                 self.update_path_input(index)
 
     def go_up(self):
+        self.materialize()
         current_index = self.tree.rootIndex()
         current_path = self.model.filePath(current_index)
         parent_path = os.path.dirname(os.path.normpath(current_path))
@@ -354,6 +4084,7 @@ class ExplorerPanel(QWidget):
                 self.update_path_input(parent_index)
 
     def go_forward(self):
+        self.materialize()
         if self.forward_paths:
             current_display_path = self.model.filePath(self.tree.rootIndex())
             self.previous_paths.append(current_display_path)
@@ -372,6 +4103,7 @@ class ExplorerPanel(QWidget):
             self.deleteLater()
 
     def on_path_input_change(self):
+        self.materialize()
         new_path = self.path_input.text().strip()
         if os.path.isdir(new_path):
             current_path = self.model.filePath(self.tree.rootIndex())
@@ -432,6 +4164,7 @@ class ExplorerPanel(QWidget):
             self.request_new_panel.emit(target_path)
 
     def show_context_menu(self, pos):
+        self.materialize()
         try:
             viewport_pos = self.tree.viewport().mapToGlobal(pos)
             index_at_pos = self.tree.indexAt(pos)
@@ -506,12 +4239,23 @@ class ExplorerPanel(QWidget):
                      (ExplorerPanel.cut_item and len(ExplorerPanel.cut_item) > 0))
             )
             menu.addAction(paste_action)
+
+            merge_paste_action = QAction("병합 붙여넣기 (바뀐 파일만)", self)
+            merge_paste_action.setToolTip("같은 이름의 폴더/파일이 있으면 새 이름으로 만들지 않고, 크기/수정 시각이 다른 파일만 덮어씁니다.")
+            merge_paste_action.triggered.connect(lambda checked, dest=str(target_dir_path_for_paste_newfolder): self.paste_item_to_path(dest, merge=True))
+            merge_paste_action.setEnabled(paste_action.isEnabled())
+            menu.addAction(merge_paste_action)
             menu.addSeparator()
 
             delete_action = QAction("삭제", self)
-            delete_action.triggered.connect(self.delete_items)
+            delete_action.triggered.connect(lambda checked: self.delete_items())
             delete_action.setEnabled(has_valid_selection)
             menu.addAction(delete_action)
+
+            purge_action = QAction("영구 삭제 (Shift+Delete)", self)
+            purge_action.triggered.connect(lambda checked: self.delete_items(permanent=True))
+            purge_action.setEnabled(has_valid_selection)
+            menu.addAction(purge_action)
             menu.addSeparator()
 
             new_folder_action = QAction("새 폴더 만들기(&N)", self)
@@ -534,6 +4278,35 @@ class ExplorerPanel(QWidget):
 
             menu.addSeparator()
 
+            large_folder_mode_action = QAction("대용량 폴더 모드", self)
+            large_folder_mode_action.setCheckable(True)
+            large_folder_mode_action.setChecked(self.model_engine == self.ENGINE_SCANDIR)
+            large_folder_mode_action.setToolTip("항목이 매우 많은 폴더를 나눠서 빠르게 불러옵니다.")
+            large_folder_mode_action.toggled.connect(lambda checked: self.set_model_engine(self.ENGINE_SCANDIR if checked else self.ENGINE_SHARED))
+            menu.addAction(large_folder_mode_action)
+
+            copy_workers_action = QAction("복사 스레드 수 (이 드라이브)...", self)
+            copy_workers_action.triggered.connect(lambda checked, p=str(target_dir_path_for_paste_newfolder): self.configure_copy_workers(p))
+            menu.addAction(copy_workers_action)
+
+            hibernate_action = QAction("유휴 패널 휴면 시간...", self)
+            hibernate_action.triggered.connect(self.configure_hibernation)
+            menu.addAction(hibernate_action)
+
+            verify_copies_action = QAction("복사 후 검증 (체크섬)", self)
+            verify_copies_action.setCheckable(True)
+            verify_copies_action.setChecked(bool(AppSettings.get(FileJob.VERIFY_SETTING, False)))
+            verify_copies_action.setToolTip("붙여넣기/드롭으로 복사한 파일을 대상에서 다시 읽어 원본 체크섬과 비교합니다.")
+            verify_copies_action.toggled.connect(lambda checked: AppSettings.set(FileJob.VERIFY_SETTING, checked))
+            menu.addAction(verify_copies_action)
+
+            merge_hash_action = QAction("병합 시 내용(체크섬)까지 비교", self)
+            merge_hash_action.setCheckable(True)
+            merge_hash_action.setChecked(bool(AppSettings.get(FileJob.MERGE_HASH_SETTING, False)))
+            merge_hash_action.setToolTip("크기가 같은 파일은 수정 시각 대신 내용을 읽어 비교합니다. 느리지만 정확합니다.")
+            merge_hash_action.toggled.connect(lambda checked: AppSettings.set(FileJob.MERGE_HASH_SETTING, checked))
+            menu.addAction(merge_hash_action)
+
             if target_item_path_for_open_props and os.path.exists(target_item_path_for_open_props):
                 prop_action = QAction("속성(&R)", self)
                 prop_action.triggered.connect(lambda checked, p=str(target_item_path_for_open_props): self.show_properties_for_path(p))
@@ -562,11 +4335,36 @@ class ExplorerPanel(QWidget):
         else:
             QMessageBox.warning(self, "오류", f"경로를 찾을 수 없습니다: {path}")
 
+    def configure_copy_workers(self, path):
+        # 붙여넣기/드롭 대상 드라이브마다 동시에 복사할 파일 수 (SSD/네트워크 드라이브는 크게, HDD 는 작게)
+        drive = TrashStore.mount_point(path)
+        workers, ok = QInputDialog.getInt(
+            self, "복사 스레드 수", f"'{drive}' 로 복사할 때 동시에 복사할 파일 수:",
+            FileJob.copy_workers_for(path), 1, FileJob.MAX_COPY_WORKERS)
+        if ok:
+            FileJob.set_copy_workers(path, workers)
+            self.window().statusBar().showMessage(f"'{drive}' 복사 스레드 수: {workers}", 3000)
+
+    def configure_hibernation(self):
+        # 이 시간 동안 건드리지 않은 대용량 폴더 모드 패널은 모델/폴더 감시를 해제 (메모리가 부족하면 더 일찍)
+        policy = PanelHibernationPolicy.instance()
+        minutes, ok = QInputDialog.getInt(
+            self, "유휴 패널 휴면", "사용하지 않은 대용량 폴더 모드 패널을 휴면시킬 시간(분, 0 = 끄기):",
+            policy.idle_seconds() // 60, 0, 24 * 60)
+        if ok:
+            policy.set_idle_minutes(minutes)
+            self.window().statusBar().showMessage(f"유휴 패널 휴면: {f'{minutes}분' if minutes else '끔'}", 3000)
+
     def show_properties_for_path(self, path):
         if os.path.exists(path): show_windows_properties(path)
         else: QMessageBox.warning(self, "오류", f"경로를 찾을 수 없습니다: {path}")
 
     def eventFilter(self, obj, event):
+        # 마우스가 지나가기만 하는 것(Enter)은 제외: 창을 가로지를 때마다 휴면 패널이 모두 깨어나지 않도록
+        if event.type() in (event.FocusIn, event.MouseButtonPress, event.KeyPress, event.Wheel, event.DragEnter) \
+                and obj in (self.tree, self.tree.viewport(), self.path_input):
+            self.last_interaction = time.monotonic()
+            self.materialize()   # 포커스/클릭/끌어오기를 받은 자리표시(휴면) 패널은 대기열을 기다리지 않고 바로 구성
         if obj == self.tree and event.type() == event.KeyPress:
             if event.key() in (Qt.Key_Enter, Qt.Key_Return):
                 selected = self.tree.selectedIndexes()
@@ -582,6 +4380,7 @@ class ExplorerPanel(QWidget):
         return super().eventFilter(obj, event)
 
     def rename_item(self, index):
+        if self.model is None: return
         if not index.isValid() or index.column() != 0:
             if index.isValid(): index = index.sibling(index.row(), 0)
             else: return
@@ -614,15 +4413,8 @@ class ExplorerPanel(QWidget):
             QMessageBox.warning(self, "새 폴더 오류", "폴더를 생성할 유효한 상위 경로가 아닙니다.")
             return
 
-        base_name = "새 폴더"
-        new_folder_path = os.path.join(parent_path_str, base_name)
-        counter = 1
-        while os.path.exists(new_folder_path):
-            new_folder_path = os.path.join(parent_path_str, f"{base_name} ({counter})")
-            counter += 1
-
         try:
-            os.mkdir(new_folder_path)
+            new_folder_path = os.path.join(parent_path_str, NameAllocator(parent_path_str).claim("새 폴더", is_dir=True))
             self.push_undo({'type': 'mkdir', 'path': new_folder_path})
 
             def _select_and_edit_new_folder():
@@ -665,6 +4457,7 @@ class ExplorerPanel(QWidget):
         QApplication.clipboard().setMimeData(mime_data)
 
     def copy_selected_items(self):
+        self.materialize()
         selected = self.tree.selectedIndexes()
         if not selected: return
         paths_to_copy = sorted(list(set(self.model.filePath(idx) for idx in selected if idx.column() == 0)))
@@ -677,6 +4470,7 @@ class ExplorerPanel(QWidget):
                 main_window.statusBar().showMessage(f"{len(paths_to_copy)}개 항목 복사됨", 2000)
 
     def cut_selected_items(self):
+        self.materialize()
         selected = self.tree.selectedIndexes()
         if not selected: return
         paths_to_cut = sorted(list(set(self.model.filePath(idx) for idx in selected if idx.column() == 0)))
@@ -688,46 +4482,17 @@ class ExplorerPanel(QWidget):
             if hasattr(main_window, 'statusBar'):
                 main_window.statusBar().showMessage(f"{len(paths_to_cut)}개 항목 잘라내기됨", 2000)
 
-    def get_non_conflicting_name(self, dest_dir, name):
-        base, ext = os.path.splitext(name)
-        counter = 1
-        new_name = name
-        while os.path.exists(os.path.join(dest_dir, new_name)):
-            new_name = f"{base} ({counter}){ext}"
-            counter += 1
-        return new_name
-
-    def paste_item_to_path(self, destination_folder):
-        pasted_something = False
+    def paste_item_to_path(self, destination_folder, merge=False):
         clipboard = QApplication.clipboard()
         mime_data = clipboard.mimeData()
 
         if mime_data.hasUrls():
             drop_effect_data = mime_data.data('application/x-qt-windows-mime;value="PreferredDropEffect"')
             is_cut_from_clipboard = drop_effect_data == b'\x02\x00\x00\x00'
-            src_urls = mime_data.urls()
-            sources_to_paste = [url.toLocalFile() for url in src_urls]
-
-            for src_path in sources_to_paste:
-                if not os.path.exists(src_path): continue
-                name = os.path.basename(os.path.normpath(src_path))
-                new_name = self.get_non_conflicting_name(destination_folder, name)
-                dest_path = os.path.join(destination_folder, new_name)
-                try:
-                    if is_cut_from_clipboard:
-                        shutil.move(src_path, dest_path)
-                        if ExplorerPanel.cut_item and src_path in ExplorerPanel.cut_item:
-                             self.push_undo({'type': 'move', 'src': src_path, 'dst': dest_path})
-                    else:
-                        if os.path.isdir(src_path): shutil.copytree(src_path, dest_path)
-                        else: shutil.copy2(src_path, dest_path)
-                        self.push_undo({'type': 'copy', 'path': dest_path})
-                    pasted_something = True
-                except Exception as e: QMessageBox.warning(self, "붙여넣기 오류", f"클립보드 항목 '{name}' 처리 실패: {e}")
-
-            if pasted_something:
+            sources_to_paste = [path for path in (url.toLocalFile() for url in mime_data.urls()) if path and os.path.exists(path)]
+            if sources_to_paste:
                 if is_cut_from_clipboard: ExplorerPanel.cut_item = None
-                self.refresh_current_view()
+                self.submit_paste_job(sources_to_paste, destination_folder, is_cut_from_clipboard, merge=merge)
                 return
 
         source_items_list = None
@@ -739,31 +4504,33 @@ class ExplorerPanel(QWidget):
             operation_is_move = True
 
         if not source_items_list:
-            if not pasted_something: QMessageBox.information(self, "붙여넣기", "붙여넣기 할 항목이 없습니다.")
+            QMessageBox.information(self, "붙여넣기", "붙여넣기 할 항목이 없습니다.")
             return
 
         if not isinstance(source_items_list, list): source_items_list = [source_items_list]
 
-        for src_path in source_items_list:
-            if not os.path.exists(src_path): continue
-            name = os.path.basename(os.path.normpath(src_path))
-            new_name = self.get_non_conflicting_name(destination_folder, name)
-            dest_path = os.path.join(destination_folder, new_name)
-            try:
-                if operation_is_move:
-                    shutil.move(src_path, dest_path)
-                    self.push_undo({'type': 'move', 'src': src_path, 'dst': dest_path})
-                else:
-                    if os.path.isdir(src_path): shutil.copytree(src_path, dest_path)
-                    else: shutil.copy2(src_path, dest_path)
-                    self.push_undo({'type': 'copy', 'path': dest_path})
-                pasted_something = True
-            except Exception as e: QMessageBox.warning(self, "붙여넣기 오류", f"내부 항목 '{name}' 처리 실패: {e}")
-
-        if operation_is_move and pasted_something: ExplorerPanel.cut_item = None
-        if pasted_something: self.refresh_current_view()
+        sources = [src_path for src_path in source_items_list if src_path and os.path.exists(src_path)]
+        if sources:
+            if operation_is_move: ExplorerPanel.cut_item = None
+            self.submit_paste_job(sources, destination_folder, operation_is_move, merge=merge)
+
+    def submit_paste_job(self, sources, destination_folder, is_move, error_title="붙여넣기 오류", merge=False):
+        # 사전 점검(크기/여유 공간)과 대상 이름 배정은 작업 스레드에서 쓰기 전에 수행
+        # merge: 같은 이름이 있으면 "이름 (1)" 대신 기존 트리에 새 파일/바뀐 파일만 복사 (이동은 평소대로)
+        target_name = os.path.basename(os.path.normpath(destination_folder)) or destination_folder
+        if is_move:
+            job = MoveJob.to_folder(sources, destination_folder, f"이동: {len(sources)}개 항목 → {target_name}")
+        elif merge:
+            job = CopyJob.to_folder(sources, destination_folder, f"병합 복사: {len(sources)}개 항목 → {target_name}")
+            job.merge = True
+            job.compare_hash = bool(AppSettings.get(FileJob.MERGE_HASH_SETTING, False))
+        else:
+            job = CopyJob.to_folder(sources, destination_folder, f"복사: {len(sources)}개 항목 → {target_name}")
+        job.verify = bool(AppSettings.get(FileJob.VERIFY_SETTING, False))
+        return self.submit_file_job(job, error_title)
 
     def paste_item(self):
+        self.materialize()
         selected_indexes = self.tree.selectedIndexes()
         destination_path = ""
 
@@ -778,7 +4545,8 @@ class ExplorerPanel(QWidget):
             if not os.path.isdir(destination_path): destination_path = QDir.rootPath()
         self.paste_item_to_path(destination_path)
 
-    def delete_items(self):
+    def delete_items(self, permanent=False):
+        self.materialize()
         selected_indexes = self.tree.selectedIndexes()
         if not selected_indexes:
             QMessageBox.information(self, "삭제", "삭제할 항목을 선택하세요.")
@@ -787,52 +4555,48 @@ class ExplorerPanel(QWidget):
         paths_to_delete = sorted(list(set(self.model.filePath(idx) for idx in selected_indexes if idx.column() == 0)))
         if not paths_to_delete: return
 
-        reply = QMessageBox.question(self, "삭제 확인",
-                                     f"{len(paths_to_delete)}개 항목을 삭제하시겠습니까?\n(이 작업은 '실행 취소'로 복구 가능합니다)",
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        if reply == QMessageBox.No: return
+        if permanent:
+            reply = QMessageBox.warning(self, "영구 삭제 확인",
+                                        f"{len(paths_to_delete)}개 항목을 영구 삭제하시겠습니까?\n(휴지통을 거치지 않으며 '실행 취소'로 복구할 수 없습니다)",
+                                        QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        else:
+            reply = QMessageBox.question(self, "삭제 확인",
+                                         f"{len(paths_to_delete)}개 항목을 삭제하시겠습니까?\n(이 작업은 '실행 취소'로 복구 가능합니다)",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes: return
 
-        self.tree.setUpdatesEnabled(False)
+        paths_to_delete = [path for path in paths_to_delete if os.path.lexists(path)]
+        if not paths_to_delete: return
         current_root_path_norm = os.path.normpath(self.model.filePath(self.tree.rootIndex()))
-        root_itself_or_direct_child_deleted = False
-
-        for path in paths_to_delete:
-            if not os.path.exists(path): continue
-            path_norm = os.path.normpath(path)
-            if path_norm == current_root_path_norm or os.path.dirname(path_norm) == current_root_path_norm:
-                root_itself_or_direct_child_deleted = True
-            try:
-                temp_dir = os.path.join(tempfile.gettempdir(), "explorerpanel_undo")
-                os.makedirs(temp_dir, exist_ok=True)
-                backup_name = os.path.basename(path) + "_" + str(uuid.uuid4().hex[:8])
-                backup_path = os.path.join(temp_dir, backup_name)
-                if os.path.isdir(path):
-                    shutil.copytree(path, backup_path)
-                    shutil.rmtree(path)
-                else:
-                    shutil.copy2(path, backup_path)
-                    os.remove(path)
-                self.push_undo({'type': 'delete', 'path': path, 'backup': backup_path})
-            except Exception as e:
-                QMessageBox.warning(self, "삭제 오류", f"'{os.path.basename(path)}' 삭제 실패: {e}")
-                print(f"Error deleting {path}: {e}")
-
-        self.tree.setUpdatesEnabled(True)
-
-        if root_itself_or_direct_child_deleted and not os.path.exists(current_root_path_norm) :
-            parent_of_old_root = os.path.dirname(current_root_path_norm)
-            if os.path.exists(parent_of_old_root) and parent_of_old_root != current_root_path_norm:
-                new_root_index = self.model.index(parent_of_old_root)
-                if new_root_index.isValid():
-                    self.tree.setRootIndex(new_root_index)
-                    self.update_path_input(new_root_index)
-            else:
-                default_path_index = self.model.index('')
-                self.tree.setRootIndex(default_path_index)
-                self.update_path_input(default_path_index)
-        else: self.refresh_current_view()
+        if permanent:
+            job = PurgeJob(paths_to_delete, f"영구 삭제: {len(paths_to_delete)}개 항목")
+        else:
+            job = DeleteJob(paths_to_delete, f"삭제: {len(paths_to_delete)}개 항목")
+        self.submit_file_job(job, "삭제 오류", functools.partial(self.on_delete_job_committed, current_root_path_norm))
+
+    def on_delete_job_committed(self, current_root_path_norm, job):
+        # 삭제 중에 보고 있던 폴더 자체가 지워졌다면 상위 폴더로 이동
+        if os.path.exists(current_root_path_norm): return
+        if self.current_root_path() != current_root_path_norm: return
+        if self.model is None:
+            self.pending_root_path = os.path.dirname(current_root_path_norm)
+            self.show_placeholder_location()
+            return
+        parent_of_old_root = os.path.dirname(current_root_path_norm)
+        if os.path.exists(parent_of_old_root) and parent_of_old_root != current_root_path_norm:
+            new_root_index = self.model.index(parent_of_old_root)
+            if new_root_index.isValid():
+                self.tree.setRootIndex(new_root_index)
+                self.update_path_input(new_root_index)
+        else:
+            default_path_index = self.model.index('')
+            self.tree.setRootIndex(default_path_index)
+            self.update_path_input(default_path_index)
 
     def on_directory_loaded(self, path):
+        if self.hibernated_view and os.path.normpath(path) == self.current_root_path():
+            # 대용량 폴더 모드는 첫 묶음에서도 알려 오므로 스캔이 끝날 때까지 복원을 이어 감
+            self.restore_hibernated_view(final=not (isinstance(self.model, ScandirListModel) and self.model.is_loading(path)))
         if self.pending_navigation_path and os.path.normpath(path) == os.path.normpath(self.pending_navigation_path):
             target_index = self.model.index(self.pending_navigation_path)
             if target_index.isValid():
@@ -1050,6 +4814,7 @@ class MainWindow(QMainWindow):
         self.favorite_layouts = {}
         self.path_favorites = {}
         self.last_splitter_states = None
+        self.main_splitter = None   # 단/열 줄 스플리터들을 담는 최상위 스플리터 (rebuild_ui_from_structure 가 관리)
 
         self.predefined_colors = {
             "연노랑": "#FFFACD", "연연두": "#caf3be", "연하늘": "#bfe5f7", "연핑크": "#fddff5", "연보라": "#dec9fa",
@@ -1071,6 +4836,8 @@ class MainWindow(QMainWindow):
 
         self.resize(1200, 800)
         self.setup_status_bar()
+        OperationJournal.instance()   # 작업 스레드보다 먼저 GUI 스레드에서 저널을 열고 재생
+        QTimer.singleShot(0, self.recover_interrupted_operations)
 
         self.load_favorites_config()
         self.update_favorite_buttons_ui()
@@ -1347,13 +5114,58 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "파일 삭제 오류", f"경로 즐겨찾기 파일 삭제 중 오류: {e}")
 
     def get_app_config_path(self, filename):
-        config_dir = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "MyMultiExplorer")
-        os.makedirs(config_dir, exist_ok=True)
-        return os.path.join(config_dir, filename)
+        return get_app_config_path(filename)
+
+    def recover_interrupted_operations(self):
+        # 지난 실행에서 끝나지 않은 파일 작업: 먼저 복사/이동을 이어서 할지 묻고,
+        # 나머지는 끝난 항목을 되돌리거나, 그대로 두고 실행 취소 기록에 남김
+        journal = OperationJournal.instance()
+        for log_path, plan, done_items, done_files in JobCheckpointLog.load_all():
+            remaining_items = [(src, dst) for src, dst in plan['items'] if dst not in done_items and os.path.lexists(src)]
+            if remaining_items:
+                reply = QMessageBox.question(
+                    self, "중단된 작업 이어하기",
+                    f"이전 실행에서 끝나지 않은 작업이 있습니다.\n\n{plan['title']}\n"
+                    f"남은 항목 {len(remaining_items)}개 / 전체 {len(plan['items'])}개 (이미 복사된 파일 {len(done_files)}개는 건너뜀)\n\n"
+                    "남은 부분만 이어서 하시겠습니까?\n'아니오'를 누르면 완료된 항목을 되돌릴지 묻습니다.",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+                if reply == QMessageBox.Yes:
+                    if plan.get('group') is not None:
+                        journal.keep_group(plan['group'], remove_partials=False)
+                    job = JobCheckpointLog.make_job(plan, remaining_items, done_files)
+                    job.on_commit = self.on_resumed_job_committed
+                    FileJobManager.instance().submit(job)
+            JobCheckpointLog.discard(log_path)
+        for group_id, group in journal.interrupted_groups():
+            if not group['actions']:
+                journal.keep_group(group_id)
+                continue
+            reply = QMessageBox.question(
+                self, "중단된 작업 복구",
+                f"이전 실행에서 끝나지 않은 작업이 있습니다.\n\n{group['title']} (완료된 항목 {len(group['actions'])}개)\n\n"
+                "완료된 항목을 모두 되돌리시겠습니까?\n'아니오'를 누르면 완료된 부분은 그대로 두고 실행 취소 기록에 남깁니다.",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                errors = journal.rollback_group(group_id)
+                if errors:
+                    QMessageBox.warning(self, "복구 오류", "\n".join(errors[:20]))
+            else:
+                journal.keep_group(group_id)
+        for panel in self.panels_in_logical_order:
+            panel.refresh_current_view()
+
+    def on_resumed_job_committed(self, job):
+        if job.verify_failures:
+            QMessageBox.critical(self, "복사 검증 실패", "\n".join(job.verify_failures[:20]))
+        elif job.errors:
+            QMessageBox.warning(self, "이어하기 오류", "\n".join(job.errors[:20]))
+        for panel in self.panels_in_logical_order:
+            panel.refresh_current_view()
 
     def save_current_state_as_default(self):
             session_file_path = self.get_app_config_path(self.SESSION_CONFIG_FILENAME)
-            panel_paths_in_order = [p.model.filePath(p.tree.rootIndex()) for p in self.panels_in_logical_order]
+            panel_paths_in_order = [p.current_root_path() for p in self.panels_in_logical_order]
+            panel_engines_in_order = [p.model_engine for p in self.panels_in_logical_order]
 
             top_splitter = self.content_area_host.findChild(QSplitter)
             saved_states = None
@@ -1364,6 +5176,7 @@ class MainWindow(QMainWindow):
                 "layout_mode": "ROW_MODE" if self.current_layout_mode == MainWindow.ROW_MODE else "COL_MODE",
                 "line_capacities": self.line_capacities,
                 "panel_paths": panel_paths_in_order,
+                "panel_engines": panel_engines_in_order,
                 "splitter_states": saved_states
             }
 
@@ -1540,10 +5353,67 @@ class MainWindow(QMainWindow):
     def setup_status_bar(self):
         status_bar = QStatusBar()
         self.setStatusBar(status_bar)
+        self.jobs_dialog = None
+        self.jobs_button = QPushButton("작업 목록")
+        self.jobs_button.setToolTip("진행 중인 복사/이동/삭제 작업을 확인하고 일시정지/취소합니다.")
+        self.jobs_button.clicked.connect(self.show_jobs_dialog)
+        status_bar.addPermanentWidget(self.jobs_button)
+        self.backup_usage_button = QPushButton("백업")
+        self.backup_usage_button.setFlat(True)
+        self.backup_usage_button.setToolTip("실행 취소용 삭제 백업 사용량입니다. 클릭하면 최대 용량/보관 기간을 설정합니다.")
+        self.backup_usage_button.clicked.connect(self.show_backup_settings_dialog)
+        status_bar.addPermanentWidget(self.backup_usage_button)
+        backup_store = BackupStore.instance()
+        backup_store.usage_changed.connect(self.update_backup_usage_button)
+        self.update_backup_usage_button(backup_store.used_bytes, backup_store.quota_bytes())
+        job_manager = FileJobManager.instance()
+        job_manager.job_changed.connect(self.on_file_job_changed)
+        job_manager.job_finished.connect(self.on_file_job_finished)
+        job_manager.job_attention.connect(self.on_file_job_attention)
         company_label = QLabel("ⓒ 2025 Mk-TECH CO.LTD,  사용문의: 내선 1206")
         company_label.setStyleSheet("color: BLACK; font-size: 10pt;")
         status_bar.addPermanentWidget(company_label)
 
+    def show_jobs_dialog(self):
+        if self.jobs_dialog is None:
+            self.jobs_dialog = FileJobsDialog(self)
+        self.jobs_dialog.show()
+        self.jobs_dialog.raise_()
+        self.jobs_dialog.activateWindow()
+
+    def show_backup_settings_dialog(self):
+        dialog = BackupSettingsDialog(self)
+        dialog.exec_()
+        dialog.deleteLater()
+
+    def update_backup_usage_button(self, used_bytes, quota_bytes):
+        self.backup_usage_button.setText(f"백업 {format_bytes(used_bytes)} / {format_bytes(quota_bytes)}")
+
+    def update_jobs_button(self):
+        active_count = len(FileJobManager.instance().active_jobs())
+        self.jobs_button.setText(f"작업 목록 ({active_count})" if active_count else "작업 목록")
+
+    def on_file_job_changed(self, job):
+        self.update_jobs_button()
+        if not job.is_finished():
+            self.statusBar().showMessage(f"{job.title} [{job.state}] {job.progress_text()}", 3000)
+
+    def on_file_job_finished(self, job):
+        self.update_jobs_button()
+        message = f"{job.title} {job.state}"
+        if job.errors: message += f" (오류 {len(job.errors)}건)"
+        if job.notes: message += " - " + " ".join(job.notes)
+        self.statusBar().showMessage(message, 5000 if job.notes else 3000)
+
+    def on_file_job_attention(self, job):
+        if job.is_finished(): return
+        reply = QMessageBox.question(self, job.title, f"{job.attention_message}\n\n계속하시겠습니까?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            job.resume()
+        else:
+            job.cancel()
+
     def clear_dynamic_content(self):
         while self.content_area_host_layout.count() > 0:
             item = self.content_area_host_layout.takeAt(0)
@@ -1580,7 +5450,7 @@ class MainWindow(QMainWindow):
             if child_states[i]:
                 self.restore_splitter_states(widget, child_states[i])
 
-    def distribute_splitter_sizes_equally(self, splitter_widget):
+    def distribute_splitter_sizes_equally(self, splitter_widget, recursive=True):
         if not isinstance(splitter_widget, QSplitter) or splitter_widget.count() == 0: return
         total_size = splitter_widget.width() if splitter_widget.orientation() == Qt.Horizontal else splitter_widget.height()
         if total_size > 10 and splitter_widget.count() > 0:
@@ -1589,62 +5459,86 @@ class MainWindow(QMainWindow):
             for i in range(total_size % count): sizes[i] += 1
             try: splitter_widget.setSizes(sizes)
             except Exception as e: print(f"Error in setSizes: {e}")
+        if not recursive: return
         for i in range(splitter_widget.count()):
             child_widget = splitter_widget.widget(i)
             if isinstance(child_widget, QSplitter): self.distribute_splitter_sizes_equally(child_widget)
 
-    def apply_splitter_sizes(self, splitter_widget):
-        if self.last_splitter_states:
-            self.restore_splitter_states(splitter_widget, self.last_splitter_states)
-            self.last_splitter_states = None
-        else:
-            self.distribute_splitter_sizes_equally(splitter_widget)
+    def apply_splitter_sizes(self, splitter_widget, changed_splitters=()):
+        # 저장된 크기가 있으면 전체를 복원하고, 아니면 구성이 바뀐 스플리터만 균등 분배 (나머지는 크기 유지)
+        try:
+            if self.last_splitter_states:
+                self.restore_splitter_states(splitter_widget, self.last_splitter_states)
+                self.last_splitter_states = None
+            else:
+                for changed_splitter in changed_splitters:
+                    self.distribute_splitter_sizes_equally(changed_splitter, recursive=False)
+        except RuntimeError:
+            pass   # 그 사이 다시 구성되어 지워진 스플리터
+
+    def create_splitter(self, orientation):
+        splitter = QSplitter(orientation)
+        splitter.setChildrenCollapsible(False)
+        return splitter
 
     def rebuild_ui_from_structure(self):
-        if self.last_splitter_states is None:
-            current_top_splitter = self.content_area_host.findChild(QSplitter)
-            if current_top_splitter:
-                self.last_splitter_states = self.save_splitter_states(current_top_splitter)
-
-        self.clear_dynamic_content()
-        if not self.panels_in_logical_order: return
-        main_splitter_orientation = Qt.Vertical if self.current_layout_mode == MainWindow.ROW_MODE else Qt.Horizontal
-        main_splitter = QSplitter(main_splitter_orientation)
-        main_splitter.setChildrenCollapsible(False)
-        self.content_area_host_layout.addWidget(main_splitter, 1)
-        if self.current_layout_mode == MainWindow.ROW_MODE:
-            self.panel_grid_structure = self._calculate_panel_grid_structure()
-            for panel_row_list in self.panel_grid_structure:
-                if not panel_row_list: continue
-                row_splitter = QSplitter(Qt.Horizontal)
-                row_splitter.setChildrenCollapsible(False)
-                for panel in panel_row_list: row_splitter.addWidget(panel)
-                if row_splitter.count() > 0 : main_splitter.addWidget(row_splitter)
-                else: row_splitter.deleteLater()
-        elif self.current_layout_mode == MainWindow.COL_MODE:
-            panel_iter = iter(self.panels_in_logical_order)
-            panels_left_to_place = True
-            current_col_caps = self.line_capacities if any(c > 0 for c in self.line_capacities) else list(self.DEFAULT_LINE_CAPACITIES)
-            cap_idx = 0
-            while panels_left_to_place:
-                capacity = current_col_caps[cap_idx] if cap_idx < len(current_col_caps) else current_col_caps[-1]
-                if capacity <= 0: capacity = 1
-                col_splitter = QSplitter(Qt.Vertical)
-                col_splitter.setChildrenCollapsible(False)
-                panels_in_current_col = 0
-                try:
-                    for _ in range(capacity):
-                        col_splitter.addWidget(next(panel_iter))
-                        panels_in_current_col += 1
-                except StopIteration: panels_left_to_place = False
-                if panels_in_current_col > 0: main_splitter.addWidget(col_splitter)
-                else: col_splitter.deleteLater()
-                if not panels_left_to_place: break
-                cap_idx +=1
-        if main_splitter.count() == 0 and self.panels_in_logical_order:
-            for panel in self.panels_in_logical_order: main_splitter.addWidget(panel)
-
-        QTimer.singleShot(0, lambda ms=main_splitter: self.apply_splitter_sizes(ms))
+        # 새 panel_grid_structure 와 지금 있는 스플리터 트리를 비교해 필요한 스플리터/패널만 추가, 이동, 제거
+        # (단/열 모드는 같은 줄 구성에 방향만 다름. 바뀌지 않은 스플리터는 그대로 두어 크기 유지)
+        self.panel_grid_structure = self._calculate_panel_grid_structure()
+        if not self.panels_in_logical_order:
+            self.clear_dynamic_content()
+            self.main_splitter = None
+            return
+        is_row_mode = self.current_layout_mode == MainWindow.ROW_MODE
+        main_orientation = Qt.Vertical if is_row_mode else Qt.Horizontal
+        line_orientation = Qt.Horizontal if is_row_mode else Qt.Vertical
+        desired_lines = [line for line in self.panel_grid_structure if line]
+        changed_splitters = []
+
+        main_splitter = self.main_splitter
+        if main_splitter is None:
+            main_splitter = self.main_splitter = self.create_splitter(main_orientation)
+            self.content_area_host_layout.addWidget(main_splitter, 1)
+        if main_splitter.orientation() != main_orientation or main_splitter.count() != len(desired_lines):
+            main_splitter.setOrientation(main_orientation)
+            changed_splitters.append(main_splitter)
+
+        # 각 줄은 그 줄 첫 패널을 이미 담고 있는 기존 줄 스플리터를 우선 재사용 (앞 줄이 빠져도 뒤 줄 크기 유지)
+        existing_lines = [main_splitter.widget(i) for i in range(main_splitter.count())]
+        claimed_lines = set()
+        for line_index, line_panels in enumerate(desired_lines):
+            line_splitter = next((ls for ls in existing_lines if id(ls) not in claimed_lines and ls.indexOf(line_panels[0]) >= 0), None)
+            if line_splitter is None:
+                line_splitter = next((ls for ls in existing_lines if id(ls) not in claimed_lines
+                                      and not any(ls.widget(i) in self.panels_in_logical_order for i in range(ls.count()))), None)
+            if line_splitter is None:
+                line_splitter = self.create_splitter(line_orientation)
+            claimed_lines.add(id(line_splitter))
+            if main_splitter.widget(line_index) is not line_splitter:
+                main_splitter.insertWidget(line_index, line_splitter)
+                if main_splitter not in changed_splitters: changed_splitters.append(main_splitter)
+            line_changed = line_splitter.orientation() != line_orientation
+            line_splitter.setOrientation(line_orientation)
+            for panel_index, panel in enumerate(line_panels):
+                if line_splitter.widget(panel_index) is not panel:
+                    line_splitter.insertWidget(panel_index, panel)   # 다른 스플리터에 있던 패널은 옮겨짐
+                    line_changed = True
+            if line_changed: changed_splitters.append(line_splitter)
+
+        # 모든 줄을 맞춘 뒤 남은 것은 제거된 패널/빈 줄
+        for line_index, line_panels in enumerate(desired_lines):
+            line_splitter = main_splitter.widget(line_index)
+            while line_splitter.count() > len(line_panels):
+                line_splitter.widget(len(line_panels)).setParent(None)
+                if line_splitter not in changed_splitters: changed_splitters.append(line_splitter)
+        while main_splitter.count() > len(desired_lines):
+            extra_splitter = main_splitter.widget(len(desired_lines))
+            extra_splitter.setParent(None)
+            extra_splitter.deleteLater()
+
+        for panel in self.panels_in_logical_order:
+            if panel.isHidden(): panel.show()
+        QTimer.singleShot(0, lambda ms=main_splitter, changed=changed_splitters: self.apply_splitter_sizes(ms, changed))
 
     def toggle_overall_layout_mode(self):
         self.current_layout_mode = MainWindow.COL_MODE if self.current_layout_mode == MainWindow.ROW_MODE else MainWindow.ROW_MODE
@@ -1669,16 +5563,23 @@ class MainWindow(QMainWindow):
             cap_idx += 1
         return new_grid_structure if new_grid_structure else [[]]
 
-    def add_explorer_panel(self, path=''):
-        panel = ExplorerPanel(path)
+    def create_panel(self, path='', engine=None, lazy=False):
+        # 모든 패널은 SharedFileSystemService 의 공유 모델에 연결되므로 패널 수와 무관하게 스캔/감시는 한 번만 일어남
+        panel = ExplorerPanel(path, engine, lazy)
         panel.delete_button.clicked.connect(functools.partial(self.request_panel_removal, panel))
         panel.request_new_panel.connect(self.add_explorer_panel)
+        return panel
+
+    def add_explorer_panel(self, path=''):
+        panel = self.create_panel(path)
         self.panels_in_logical_order.append(panel)
         self.rebuild_ui_from_structure()
 
     def request_panel_removal(self, panel_to_remove, rebuild_after=True):
         if panel_to_remove in self.panels_in_logical_order:
             self.panels_in_logical_order.remove(panel_to_remove)
+            PanelMaterializationQueue.instance().discard(panel_to_remove)
+            PanelHibernationPolicy.instance().unregister(panel_to_remove)
             panel_to_remove.deleteLater()
             if rebuild_after: self.rebuild_ui_from_structure()
 
@@ -1704,11 +5605,13 @@ class MainWindow(QMainWindow):
         if top_splitter:
             saved_states = self.save_splitter_states(top_splitter)
 
-        panel_paths = [p.model.filePath(p.tree.rootIndex()) for p in self.panels_in_logical_order]
+        panel_paths = [p.current_root_path() for p in self.panels_in_logical_order]
+        panel_engines = [p.model_engine for p in self.panels_in_logical_order]
         layout_data = {
             "layout_mode": "ROW_MODE" if self.current_layout_mode == MainWindow.ROW_MODE else "COL_MODE",
             "line_capacities": self.line_capacities,
             "panel_paths": panel_paths,
+            "panel_engines": panel_engines,
             "splitter_states": saved_states
         }
         if include_favorites: layout_data["favorite_layouts"] = self.favorite_layouts
@@ -1720,6 +5623,41 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "저장 오류", f"레이아웃 저장 중 오류 발생: {e}")
             return False
 
+    def reuse_panels_for_layout(self, entries):
+        # 지금 있는 패널을 새 레이아웃 항목에 배정: 같은 경로+엔진 > 같은 엔진 > 아무 패널 순.
+        # 재사용 패널은 루트 인덱스만 바꾸므로 경로가 바뀐 패널만 디렉토리를 새로 읽음
+        pool = list(self.panels_in_logical_order)
+        assigned = [None] * len(entries)
+
+        def normalized_engine(engine):
+            return engine if engine in (ExplorerPanel.ENGINE_SHARED, ExplorerPanel.ENGINE_SCANDIR) else ExplorerPanel.DEFAULT_MODEL_ENGINE
+
+        def normalized_path(path):
+            return os.path.normpath(path) if path and os.path.isdir(path) else os.path.normpath(QDir.homePath())
+
+        matchers = (
+            lambda panel, path, engine: panel.model_engine == normalized_engine(engine) and panel.current_root_path() == normalized_path(path),
+            lambda panel, path, engine: panel.model_engine == normalized_engine(engine),
+            lambda panel, path, engine: True,
+        )
+        for matches in matchers:
+            for i, (path, engine) in enumerate(entries):
+                if assigned[i] is not None: continue
+                panel = next((p for p in pool if matches(p, path, engine)), None)
+                if panel is not None:
+                    pool.remove(panel)
+                    assigned[i] = panel
+
+        for i, (path, engine) in enumerate(entries):
+            if assigned[i] is None:
+                assigned[i] = self.create_panel(path, engine, lazy=True)   # 처음 보일 때 구성 (시작 시간이 패널 수와 무관)
+            else:
+                assigned[i].reset_to_location(path, engine)
+
+        for panel in pool:
+            self.request_panel_removal(panel, rebuild_after=False)
+        return assigned
+
     def load_layout_from_file(self, filepath, is_session_load_for_panels_only=False):
         if not filepath or not os.path.exists(filepath):
             if not is_session_load_for_panels_only:
@@ -1730,10 +5668,6 @@ class MainWindow(QMainWindow):
 
             self.last_splitter_states = layout_data.get("splitter_states", None)
 
-            for panel in list(self.panels_in_logical_order):
-                self.request_panel_removal(panel, rebuild_after=False)
-            self.panels_in_logical_order.clear()
-
             mode_str = layout_data.get("layout_mode", "ROW_MODE")
             self.current_layout_mode = MainWindow.ROW_MODE if mode_str == "ROW_MODE" else MainWindow.COL_MODE
 
@@ -1745,13 +5679,10 @@ class MainWindow(QMainWindow):
             self.line_capacity_button.setText(f"최대: {','.join(map(str, self.line_capacities))}")
 
             panel_paths = layout_data.get("panel_paths", [])
+            panel_engines = layout_data.get("panel_engines", [])
 
-            if panel_paths:
-                for path in panel_paths:
-                    panel = ExplorerPanel(path)
-                    panel.delete_button.clicked.connect(functools.partial(self.request_panel_removal, panel))
-                    panel.request_new_panel.connect(self.add_explorer_panel)
-                    self.panels_in_logical_order.append(panel)
+            entries = [(path, panel_engines[i] if i < len(panel_engines) else None) for i, path in enumerate(panel_paths)]
+            self.panels_in_logical_order = self.reuse_panels_for_layout(entries)
 
             self.rebuild_ui_from_structure()
             return True